@@ -1,18 +1,27 @@
 import logging
+import os
 
-from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from datetime import datetime
+from typing import Literal
+
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 
 from apscheduler.schedulers.background import BackgroundScheduler
+from pydantic import TypeAdapter
 
 from app.logging_config import configure_logging
-from app.models import NewsItem
-from app.filtering import is_relevant, compute_relevance_score
+from app.models import NewsItem, Subscription
+from app.filtering import get_scorer, reload_relevance_config, reload_if_changed
 from app.storage import NewsStorage
-from app.ranking import sort_news_items
+from app.snapshot import SnapshotReader
 from app.ingestion import fetch_all_sources
+from app.export import buffered, gzip_stream, iter_export_lines
+from app.compression import IDENTITY, PayloadCache, negotiate_encoding
+from app.trends import TrendRollups
+from app.subscriptions import SubscriptionRegistry
 
 # Logging configuration
 configure_logging()
@@ -20,17 +29,69 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Mock IT Newsfeed API")
 
+# Read-only workers serve from the snapshot published by the writer instead of owning a store.
+# Run one writer and any number of NEWS_READ_ONLY=1 workers sharing NEWS_SNAPSHOT_FILE.
+READ_ONLY = os.getenv("NEWS_READ_ONLY", "").lower() in ("1", "true", "yes")
+SNAPSHOT_FILE = os.getenv("NEWS_SNAPSHOT_FILE", ".data/news_store.snapshot")
+
 # Initialize storage
-storage = NewsStorage()
+if READ_ONLY:
+    storage = None
+    snapshot = SnapshotReader(SNAPSHOT_FILE)
+else:
+    storage = NewsStorage(half_life_hours=get_scorer().half_life_hours, snapshot_file=SNAPSHOT_FILE)
+    snapshot = None
+
+# Hourly keyword/source counters, maintained at ingest by the writer
+trends = TrendRollups()
+
+# Saved queries matched against newly stored items, owned by the writer
+subscriptions = None if READ_ONLY else SubscriptionRegistry(persistence_file=".data/subscriptions.json")
+
+# Encoded /retrieve payloads, rebuilt once per storage version. Read-only workers
+# only cache compressed bytes: the uncompressed body is rebuilt from the shared snapshot.
+retrieve_cache = PayloadCache(cache_identity=not READ_ONLY)
+news_list_adapter = TypeAdapter(list[NewsItem])
 
 # Setup templates and static files
 templates = Jinja2Templates(directory="app/templates")
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
+# === Relevance Filtering ===
+def filter_relevant(items: list[NewsItem]) -> list[tuple[NewsItem, list[str]]]:
+    """
+    Score items with a single scorer snapshot and keep those above its threshold,
+    together with the keywords they matched.
+    """
+    scorer = get_scorer()
+    relevant = []
+    for item in items:
+        score, keywords = scorer.score_with_matches(item)
+        if score >= scorer.threshold:
+            item.relevance_score = score
+            relevant.append((item, keywords))
+    return relevant
+
+def ingest(items: list[NewsItem]) -> int:
+    """
+    Filter and store items. Newly stored ones are counted in the trend rollups
+    and queued for the subscriptions they match.
+    Returns:
+        int: Number of relevant items.
+    """
+    relevant = filter_relevant(items)
+    keywords_by_id: dict[str, list[str]] = {}
+    for item, keywords in relevant:
+        keywords_by_id.setdefault(item.id, keywords)
+    for item in storage.add_many([item for item, _ in relevant]):
+        trends.record(item, keywords_by_id[item.id])
+        subscriptions.percolate(item)
+    return len(relevant)
+
 # === Continuous Fetch Job ===
 def scheduled_fetch():
     logger.info("🔄 [Scheduled] Fetching and ingesting news...")
-    raw_items = fetch_all_sources()
+    raw_items = fetch_all_sources(known_ids=storage)
 
     # Convert dicts to NewsItem models
     typed_items = []
@@ -40,23 +101,61 @@ def scheduled_fetch():
         except Exception as e:
             logger.info(f"⚠️ Skipped invalid item: {e}")
 
-    relevant = []
-    for item in typed_items:
-        if is_relevant(item):
-            item.relevance_score = compute_relevance_score(item)
-            relevant.append(item)
+    accepted = ingest(typed_items)
+    logger.info(f"✅ [Scheduled] Ingested {accepted} items")
+
+# === Relevance Config Reload ===
+def rescore_stored_items():
+    logger.info("🔄 Rescoring stored news items...")
+    scorer = get_scorer()
+    keywords_by_id: dict[str, list[str]] = {}
+
+    def score(item: NewsItem) -> float:
+        score, keywords_by_id[item.id] = scorer.score_with_matches(item)
+        return score
 
-    storage.add_many(relevant)
-    logger.info(f"✅ [Scheduled] Ingested {len(relevant)} items")
+    storage.rescore(score)
+    # Matched keywords may have changed too, so rollups are recomputed from the store,
+    # reusing the matches of the rescore pass (items stored since are scored here)
+    trends.rebuild(
+        (item, keywords_by_id[item.id] if item.id in keywords_by_id else scorer.score_with_matches(item)[1])
+        for _, item in storage.iter_items()
+    )
+
+def schedule_rescore():
+    # One-off job, runs in the scheduler's thread pool so requests are not blocked
+    scheduler.add_job(rescore_stored_items)
+
+def apply_reloaded_config():
+    storage.set_half_life(get_scorer().half_life_hours)
+    schedule_rescore()
+
+def watch_relevance_config():
+    if reload_if_changed():
+        apply_reloaded_config()
 
 scheduler = BackgroundScheduler()
-scheduler.add_job(scheduled_fetch, "interval", minutes=1)
-scheduler.start()
+if not READ_ONLY:
+    scheduler.add_job(scheduled_fetch, "interval", minutes=1)
+    scheduler.add_job(watch_relevance_config, "interval", seconds=5)
+    scheduler.start()
+
+    # Scores and rollups are not persisted, so they are rebuilt once on startup
+    schedule_rescore()
+
+
+def writable_storage() -> NewsStorage:
+    """
+    Dependency for endpoints that need the store itself, which only the writer owns.
+    """
+    if storage is None:
+        raise HTTPException(status_code=503, detail="Not available on read-only workers, send this request to the writer instance.")
+    return storage
 
 
 # === Routes ===
 
-@app.post("/ingest", status_code=200)
+@app.post("/ingest", status_code=200, dependencies=[Depends(writable_storage)])
 def ingest_items(items: list[NewsItem]):
     """
     Accepts a list of news items, filters them, and stores only the relevant ones.
@@ -64,34 +163,178 @@ def ingest_items(items: list[NewsItem]):
     if not items:
         return {"message": "No items provided, nothing to ingest.", "accepted": 0, "total": 0}
 
-    relevant = []
-    for item in items:
-        if is_relevant(item):
-            item.relevance_score = compute_relevance_score(item)
-            relevant.append(item)
-
-    storage.add_many(relevant)
-    return {"accepted": len(relevant), "total": len(items)}
+    accepted = ingest(items)
+    return {"accepted": accepted, "total": len(items)}
 
 
 @app.get("/retrieve", response_model=list[NewsItem])
-def retrieve_items():
+def retrieve_items(
+    request: Request,
+    mode: Literal["relevance", "decayed"] = Query("relevance", description="Ranking mode"),
+    limit: int | None = Query(None, ge=1, description="Maximum number of items to return"),
+):
     """
     Returns stored relevant news items sorted by relevance × recency.
+
+    In "relevance" mode items are ordered by score, with recency breaking ties.
+    In "decayed" mode items are ordered by score · e^(−λ·age), where λ is
+    derived from the configured recency half-life.
+
+    The response is compressed with brotli or gzip when the client accepts it.
+    Encoded payloads are cached per storage version, so they are only rebuilt
+    after the store changes, and clients can revalidate with the ETag.
     """
-    all_items = storage.get_all()
-    return sort_news_items(all_items)
+    if storage is None:
+        snapshot.refresh()
+        current_version = snapshot.version
+
+        def build():
+            return snapshot.ranked_json_with_version(limit=limit, mode=mode)
+    else:
+        current_version = storage.version
+
+        def build():
+            version, items = storage.get_ranked_with_version(limit=limit, mode=mode)
+            return version, news_list_adapter.dump_json(items)
+
+    headers = {"Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+    etag = f'W/"{current_version}-{mode}-{limit or "all"}"'
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={**headers, "ETag": etag})
+
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    version, payload = retrieve_cache.get((mode, limit), encoding, current_version, build)
+    headers["ETag"] = f'W/"{version}-{mode}-{limit or "all"}"'
+    if encoding != IDENTITY:
+        headers["Content-Encoding"] = encoding
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+
+@app.get("/export")
+def export_items(
+    since: datetime | None = Query(None, description="Only items published at or after this time"),
+    until: datetime | None = Query(None, description="Only items published before this time"),
+    source: str | None = Query(None, description="Only items from this source"),
+    cursor: int = Query(0, ge=0, description="Resume after the item whose line carried this cursor"),
+    limit: int | None = Query(None, ge=1, description="Maximum number of items to export"),
+    compression: Literal["gzip", "none"] = Query("gzip", description="Compression of the NDJSON stream"),
+):
+    """
+    Streams stored items as NDJSON, in insertion order, straight from storage.
+
+    Items are read and encoded one batch at a time, so memory use does not depend on
+    the size of the store. Each line has a "cursor" to resume an interrupted export.
+    """
+    if storage is None:
+        snapshot.refresh()
+        items = snapshot.iter_items(start=cursor)
+    else:
+        items = storage.iter_items(start=cursor)
+    chunks = buffered(iter_export_lines(items, since=since, until=until, source=source, limit=limit))
+    if compression == "gzip":
+        return StreamingResponse(
+            gzip_stream(chunks),
+            media_type="application/gzip",
+            headers={"Content-Disposition": 'attachment; filename="news-export.ndjson.gz"'},
+        )
+    return StreamingResponse(chunks, media_type="application/x-ndjson")
+
+
+@app.get("/trends", dependencies=[Depends(writable_storage)])
+def get_trends(
+    group_by: Literal["keyword", "source"] = Query("keyword", description="Series per matched keyword or per source"),
+    keyword: str | None = Query(None, description="Only count items matching this keyword"),
+    source: str | None = Query(None, description="Only count items from this source"),
+    window_hours: int = Query(24, ge=1, description="Length of the window, ending now"),
+    max_points: int = Query(48, ge=1, le=500, description="Maximum points per series, longer windows are downsampled"),
+):
+    """
+    Returns item counts and relevance score sums over time, per keyword or per source.
+
+    Served from hourly rollups updated at ingest, so the cost depends on the
+    window length rather than on the number of stored items.
+    E.g. ransomware mentions per hour by source: /trends?group_by=source&keyword=ransomware
+    """
+    window_buckets = window_hours * 3600 // trends.bucket_seconds
+    return trends.query(
+        group_by=group_by,
+        keyword=keyword,
+        source=source,
+        window_buckets=max(window_buckets, 1),
+        max_points=max_points,
+    )
+
+
+@app.post("/subscriptions", status_code=201, response_model=Subscription, dependencies=[Depends(writable_storage)])
+def create_subscription(subscription: Subscription):
+    """
+    Registers a standing filter. Items stored from now on that match all of its
+    criteria are queued and can be read from /subscriptions/{id}/items.
+    """
+    return subscriptions.add(subscription)
+
+
+@app.get("/subscriptions", response_model=list[Subscription], dependencies=[Depends(writable_storage)])
+def list_subscriptions():
+    """
+    Lists the registered subscriptions.
+    """
+    return subscriptions.get_all()
+
+
+@app.delete("/subscriptions/{subscription_id}", dependencies=[Depends(writable_storage)])
+def delete_subscription(subscription_id: str):
+    """
+    Removes a subscription and its queued items.
+    """
+    if not subscriptions.remove(subscription_id):
+        raise HTTPException(status_code=404, detail="Subscription not found")
+    return {"status": "deleted"}
+
+
+@app.get("/subscriptions/{subscription_id}/items", dependencies=[Depends(writable_storage)])
+def get_subscription_items(
+    subscription_id: str,
+    after: int = Query(0, ge=0, description="Cursor returned by the previous call"),
+    limit: int | None = Query(None, ge=1, description="Maximum number of items to return"),
+):
+    """
+    Returns the items matched by a subscription after the given cursor, oldest first.
+    Only the latest `max_items` matches of each subscription are kept.
+    """
+    try:
+        items, cursor = subscriptions.items(subscription_id, after=after, limit=limit)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Subscription not found")
+    return {"items": news_list_adapter.dump_python(items, mode="json"), "cursor": cursor}
 
 
 @app.post("/reset")
-def reset_storage():
+def reset_storage(storage: NewsStorage = Depends(writable_storage)):
     """
     Clears all stored news items.
     """
     storage.clear()
+    trends.clear()
+    subscriptions.clear_queues()
     return {"status": "cleared"}
 
 
+@app.post("/config/reload", dependencies=[Depends(writable_storage)])
+def reload_config():
+    """
+    Reloads the relevance config and rescores stored items in the background.
+    """
+    try:
+        reload_relevance_config()
+    except Exception as e:
+        logger.error(f"Error reloading relevance config: {e}")
+        raise HTTPException(status_code=400, detail=f"Invalid relevance config: {e}")
+    apply_reloaded_config()
+    return {"status": "reloaded"}
+
+
 @app.get("/", response_class=HTMLResponse)
 def show_dashboard(request: Request):
     """
@@ -0,0 +1,160 @@
+import gzip
+import logging
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Hashable
+
+import brotli
+
+logger = logging.getLogger(__name__)
+
+IDENTITY = "identity"
+# Preferred first when the client accepts several encodings with the same weight
+SUPPORTED_ENCODINGS = ("br", "gzip")
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 8  # Payloads are compressed once per storage version, so favour ratio over speed
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str:
+    """
+    Pick the response encoding from an Accept-Encoding header.
+    Args:
+        accept_encoding (str, optional): The raw header value.
+    Returns:
+        str: "br", "gzip" or "identity".
+    """
+    if not accept_encoding:
+        return IDENTITY
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+
+    best, best_weight = IDENTITY, 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return body
+
+
+class _Build:
+    """
+    A payload build in progress, shared by every request waiting for it.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.waiters = 0
+        self.result: tuple[int | None, bytes] | None = None
+
+
+class PayloadCache:
+    """
+    Cache of encoded response payloads, keyed by storage version.
+
+    Each payload is serialized and compressed once per storage version and
+    encoding: concurrent requests for the same payload wait for a single build
+    instead of compressing it in parallel. Entries of older versions are dropped
+    as soon as a newer one is stored. At most `max_entries` payloads are kept
+    (least recently used evicted).
+
+    With `cache_identity=False` uncompressed bodies are never kept, e.g. when they
+    can be rebuilt cheaply from a shared memory-mapped snapshot and keeping them
+    would put a private copy of the corpus in every worker process.
+    """
+
+    def __init__(self, max_entries: int = 64, cache_identity: bool = True):
+        self._max_entries = max_entries
+        self._cache_identity = cache_identity
+        self._entries: OrderedDict[tuple, bytes] = OrderedDict()
+        self._building: dict[tuple, _Build] = {}
+        self._lock = Lock()
+
+    def _lookup(self, cache_key: tuple) -> bytes | None:
+        with self._lock:
+            payload = self._entries.get(cache_key)
+            if payload is not None:
+                self._entries.move_to_end(cache_key)
+            return payload
+
+    def _store(self, version: int | None, key: Hashable, encoding: str, body: bytes, payload: bytes) -> None:
+        with self._lock:
+            stale = [
+                cache_key for cache_key in self._entries
+                if cache_key[0] != version and (cache_key[0] is None or version is None or cache_key[0] < version)
+            ]
+            for cache_key in stale:
+                del self._entries[cache_key]
+            if self._cache_identity:
+                self._entries[(version, key, IDENTITY)] = body
+            self._entries[(version, key, encoding)] = payload
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def get(
+        self,
+        key: Hashable,
+        encoding: str,
+        version: int | None,
+        build: Callable[[], tuple[int | None, bytes]],
+    ) -> tuple[int | None, bytes]:
+        """
+        Return the payload for `key` in `encoding`, building it if not cached.
+        Args:
+            key (Hashable): Identifies the response variant, e.g. the query parameters.
+            encoding (str): Content encoding of the payload.
+            version (int, optional): Current storage version.
+            build (Callable): Returns (version, uncompressed body), read consistently from storage.
+        Returns:
+            tuple[int | None, bytes]: The version the payload was built at and the encoded payload.
+        """
+        cache_key = (version, key, encoding)
+        payload = self._lookup(cache_key)
+        if payload is not None:
+            return version, payload
+        if encoding == IDENTITY and not self._cache_identity:
+            return build()
+
+        # Requests arriving while a build runs wait for it and share its result, which
+        # may be for a newer version than requested if the store changed meanwhile
+        with self._lock:
+            flight = self._building.setdefault(cache_key, _Build())
+            flight.waiters += 1
+        try:
+            with flight.lock:
+                if flight.result is not None:
+                    return flight.result
+                payload = self._lookup(cache_key)
+                if payload is not None:
+                    return version, payload
+                body = self._lookup((version, key, IDENTITY)) if self._cache_identity else None
+                if body is None:
+                    version, body = build()
+                payload = compress(body, encoding)
+                self._store(version, key, encoding, body, payload)
+                flight.result = version, payload
+        finally:
+            # The build is forgotten only once its last waiter is done with it
+            with self._lock:
+                flight.waiters -= 1
+                if flight.waiters == 0:
+                    del self._building[cache_key]
+        logger.debug(f"Encoded payload {key} ({encoding}) at version {version}: {len(body)} -> {len(payload)} bytes")
+        return version, payload
@@ -0,0 +1,82 @@
+import json
+import logging
+import zlib
+from datetime import datetime, timezone
+from typing import Iterable, Iterator
+
+from app.models import NewsItem
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Timestamps without an offset are assumed to be UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def iter_export_lines(
+    items: Iterable[tuple[int, NewsItem]],
+    since: datetime | None = None,
+    until: datetime | None = None,
+    source: str | None = None,
+    limit: int | None = None,
+) -> Iterator[bytes]:
+    """
+    Encode matching items as NDJSON lines, one item at a time.
+
+    Every line carries a "cursor" field: passing it back as the export cursor
+    resumes right after that item.
+    Args:
+        items (Iterable[tuple[int, NewsItem]]): (position, item) pairs, e.g. from NewsStorage.iter_items.
+        since (datetime, optional): Only items published at or after this time.
+        until (datetime, optional): Only items published before this time.
+        source (str, optional): Only items from this source (case-insensitive).
+        limit (int, optional): Stop after this many matching items.
+    Yields:
+        bytes: One newline-terminated JSON object per item.
+    """
+    since = _as_utc(since) if since else None
+    until = _as_utc(until) if until else None
+    source = source.lower() if source else None
+    exported = 0
+    for position, item in items:
+        published_at = _as_utc(item.published_at)
+        if since and published_at < since:
+            continue
+        if until and published_at >= until:
+            continue
+        if source and item.source.lower() != source:
+            continue
+        record = {"cursor": position + 1, **item.model_dump(mode="json")}
+        yield json.dumps(record, ensure_ascii=False).encode() + b"\n"
+        exported += 1
+        if limit is not None and exported >= limit:
+            return
+
+
+def buffered(chunks: Iterable[bytes], size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Group small chunks into blocks of roughly `size` bytes to limit per-chunk overhead.
+    """
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        if len(buffer) >= size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Compress a stream of chunks into a single gzip member without buffering the input.
+    """
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)  # gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
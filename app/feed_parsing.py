@@ -0,0 +1,189 @@
+import logging
+import re
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from html.entities import name2codepoint
+from typing import IO, Iterator
+from xml.etree import ElementTree
+
+import requests
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+MAX_SUMMARY_CHARS = 2000
+READ_CHUNK_SIZE = 64 * 1024
+# Sent instead of the default python-requests agent, which some sites block
+USER_AGENT = "real-time-it-news/1.0 (+https://github.com/paolomotta/real-time-it-news)"
+
+# Local tag names (namespace stripped) of the elements we read from RSS 0.9x/1.0/2.0 and Atom feeds
+ENTRY_TAGS = {"item", "entry"}
+ID_TAGS = ("guid", "id")
+SUMMARY_TAGS = ("description", "summary", "encoded", "content")
+DATE_TAGS = ("pubDate", "published", "date", "updated")
+
+
+XML_ENTITIES = {"amp", "lt", "gt", "quot", "apos"}
+ENTITY_PATTERN = re.compile(rb"&([A-Za-z][A-Za-z0-9]{1,31});")
+# Longest possible entity reference, held back when a chunk ends inside one
+MAX_ENTITY_BYTES = 34
+
+
+def _replace_html_entity(match: re.Match) -> bytes:
+    name = match.group(1).decode("ascii")
+    codepoint = name2codepoint.get(name)
+    if name in XML_ENTITIES or codepoint is None:
+        return match.group(0)
+    return b"&#%d;" % codepoint
+
+
+def _translate_html_entities(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """
+    Rewrite HTML named entities (e.g. &eacute; or &nbsp;), which are undefined in XML
+    and would abort the strict parser, as numeric character references.
+    """
+    pending = b""
+    for chunk in chunks:
+        data = pending + chunk
+        # Hold back a trailing reference that may continue in the next chunk
+        split = data.rfind(b"&", max(0, len(data) - MAX_ENTITY_BYTES))
+        if split == -1 or b";" in data[split:]:
+            split = len(data)
+        data, pending = data[:split], data[split:]
+        yield ENTITY_PATTERN.sub(_replace_html_entity, data)
+    if pending:
+        yield ENTITY_PATTERN.sub(_replace_html_entity, pending)
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _parse_date(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = parsedate_to_datetime(value)  # RFC 822, used by RSS
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value)  # ISO 8601, used by Atom and Dublin Core
+        except ValueError:
+            logger.debug(f"Unparseable feed date: {value}")
+            return None
+    # Dates without an offset are assumed to be UTC
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _plain_text(text: str) -> str:
+    """
+    Strip the markup from an entry's HTML title or summary, keeping only its text.
+    Feeds carry entity-escaped HTML, which must not reach clients as markup.
+    """
+    if "<" in text or "&" in text:
+        text = BeautifulSoup(text, "html.parser").get_text(" ")
+    return " ".join(text.split())
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rstrip() + "…"
+
+
+def _entry_from_element(elem: ElementTree.Element, max_summary_chars: int) -> dict:
+    """
+    Build an entry dict from the direct children of an <item>/<entry> element.
+    Nested elements (e.g. Atom <source> or <author>) are ignored.
+    """
+    fields: dict[str, str] = {}
+    link = None
+    for child in elem:
+        name = _local_name(child.tag)
+        if name == "link":
+            # Atom links carry the URL in href, prefer the alternate one
+            href = child.get("href")
+            if href is not None:
+                if link is None or child.get("rel", "alternate") == "alternate":
+                    link = href
+            elif child.text and link is None:
+                link = child.text.strip()
+        elif name not in fields:
+            fields[name] = "".join(child.itertext()).strip()
+
+    entry_id = next((fields[tag] for tag in ID_TAGS if fields.get(tag)), None) or link
+    summary = next((fields[tag] for tag in SUMMARY_TAGS if fields.get(tag)), "")
+    published = next((fields[tag] for tag in DATE_TAGS if fields.get(tag)), None)
+    return {
+        "id": entry_id,
+        "link": link,
+        "title": _plain_text(fields.get("title", "")),
+        "summary": _truncate(_plain_text(summary), max_summary_chars),
+        "published": _parse_date(published),
+    }
+
+
+def iter_feed_entries(stream: IO[bytes], max_summary_chars: int = MAX_SUMMARY_CHARS) -> Iterator[dict]:
+    """
+    Incrementally parse an RSS or Atom document, yielding one entry dict at a time.
+
+    The document is read in chunks and every entry is detached from the tree once
+    yielded, so memory stays bounded by the largest single entry rather than the
+    whole feed. Stopping the iteration (e.g. after a limit) stops reading the stream.
+    Args:
+        stream (IO[bytes]): Binary file-like object with the feed document.
+        max_summary_chars (int): Summaries longer than this are truncated.
+    Yields:
+        dict: Entry with "id", "link", plain text "title" and "summary", and "published" (datetime or None).
+    """
+    parser = ElementTree.XMLPullParser(events=("start", "end"))
+    stack: list[ElementTree.Element] = []
+    entry_depth = None
+    chunks = _translate_html_entities(iter(lambda: stream.read(READ_CHUNK_SIZE), b""))
+    done = False
+    while not done:
+        chunk = next(chunks, b"")
+        done = not chunk
+        try:
+            if chunk:
+                parser.feed(chunk)
+            else:
+                parser.close()
+            # Parse errors are queued after the events preceding them
+            for event, elem in parser.read_events():
+                if event == "start":
+                    stack.append(elem)
+                    if entry_depth is None and _local_name(elem.tag) in ENTRY_TAGS:
+                        entry_depth = len(stack)
+                    continue
+                stack.pop()
+                if entry_depth is not None and len(stack) + 1 == entry_depth:
+                    entry_depth = None
+                    entry = _entry_from_element(elem, max_summary_chars)
+                    # Detach the finished entry so the tree does not grow with the feed
+                    if stack:
+                        stack[-1].remove(elem)
+                    elem.clear()
+                    yield entry
+        except ElementTree.ParseError as e:
+            logger.warning(f"Malformed feed, stopping after entries parsed so far: {e}")
+            return
+
+
+@contextmanager
+def open_feed(url: str, timeout: float = 10.0):
+    """
+    Open a feed URL or local file path as a binary stream without reading it fully.
+    """
+    if url.startswith(("http://", "https://")):
+        with requests.get(url, stream=True, timeout=timeout, headers={"User-Agent": USER_AGENT}) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            yield response.raw
+    else:
+        path = url[len("file://"):] if url.startswith("file://") else url
+        with open(path, "rb") as f:
+            yield f
@@ -1,43 +1,148 @@
 import re
 import logging
+from pathlib import Path
+from threading import Lock
+
 import yaml
 from app.models import NewsItem
+from app.ranking import DEFAULT_HALF_LIFE_HOURS
 
 logger = logging.getLogger(__name__)
 
-def load_relevance_config(config_path="config/relevance_config.yaml"):
+DEFAULT_CONFIG_PATH = "config/relevance_config.yaml"
+
+def load_relevance_config(config_path=DEFAULT_CONFIG_PATH):
     with open(config_path, "r") as f:
         config = yaml.safe_load(f)
     return config
 
-_config = load_relevance_config()
-KEYWORD_SCORES = _config["keyword_scores"]
-PATTERN_BONUSES = [(entry["pattern"], entry["bonus"]) for entry in _config["pattern_bonuses"]]
-SOURCE_WEIGHTS = _config["source_weights"]
-THRESHOLD = _config.get("threshold", 2.0)  # Default to 2.0 if not set
 
-def compute_relevance_score(item: NewsItem) -> float:
-    content = f"{item.title}".lower()
-    score = 0
+class RelevanceScorer:
+    """
+    Immutable scorer compiled from a relevance config.
+
+    A new instance is built on every reload and swapped in as a whole, so a
+    caller holding a scorer always sees one consistent set of keywords,
+    patterns, weights, threshold and recency half-life.
+    """
+
+    def __init__(self, config: dict, config_path: str | None = None, mtime: float | None = None):
+        config = config or {}
+        self.keyword_scores: dict[str, float] = dict(config.get("keyword_scores") or {})
+        self.pattern_bonuses: list[tuple[str, float]] = [
+            (entry["pattern"], entry["bonus"]) for entry in (config.get("pattern_bonuses") or [])
+        ]
+        self.source_weights: dict[str, float] = dict(config.get("source_weights") or {})
+        self.threshold: float = config.get("threshold", 2.0)  # Default to 2.0 if not set
+        self.half_life_hours: float = config.get("recency_half_life_hours", DEFAULT_HALF_LIFE_HOURS)
+        if self.half_life_hours <= 0:
+            raise ValueError("recency_half_life_hours must be positive")
+        self.config_path = config_path
+        self.mtime = mtime
+        self._compiled_patterns = [
+            (pattern, re.compile(pattern, flags=re.IGNORECASE), bonus)
+            for pattern, bonus in self.pattern_bonuses
+        ]
+
+    @classmethod
+    def from_file(cls, config_path: str = DEFAULT_CONFIG_PATH) -> "RelevanceScorer":
+        mtime = Path(config_path).stat().st_mtime
+        return cls(load_relevance_config(config_path), config_path=config_path, mtime=mtime)
+
+    def score(self, item: NewsItem) -> float:
+        return self.score_with_matches(item)[0]
+
+    def score_with_matches(self, item: NewsItem) -> tuple[float, list[str]]:
+        """
+        Score an item and return the configured keywords found in its title.
+        """
+        content = f"{item.title}".lower()
+        score = 0
+        matched = []
+
+        for keyword, weight in self.keyword_scores.items():
+            if keyword in content:
+                logger.debug(f"Keyword '{keyword}' matched in item '{item.id}' (+{weight})")
+                score += weight
+                matched.append(keyword)
+
+        for pattern, regex, bonus in self._compiled_patterns:
+            if regex.search(content):
+                logger.debug(f"Pattern '{pattern}' matched in item '{item.id}' (+{bonus})")
+                score += bonus
+
+        source_weight = self.source_weights.get(item.source.lower(), 1.0)
+        final_score = score * source_weight
+        logger.debug(f"Item '{item.id}' base score: {score}, source weight: {source_weight}, final score: {final_score}")
+        return final_score, matched
+
+
+_scorer = RelevanceScorer.from_file()
+_reload_lock = Lock()
 
-    keyword_scores = KEYWORD_SCORES if KEYWORD_SCORES is not None else {}
-    pattern_bonuses = PATTERN_BONUSES if PATTERN_BONUSES is not None else []
-    source_weights = SOURCE_WEIGHTS if SOURCE_WEIGHTS is not None else {}
+# Kept for backwards compatibility; refreshed on every reload.
+KEYWORD_SCORES = _scorer.keyword_scores
+PATTERN_BONUSES = _scorer.pattern_bonuses
+SOURCE_WEIGHTS = _scorer.source_weights
+THRESHOLD = _scorer.threshold
 
-    for keyword, weight in keyword_scores.items():
-        if keyword in content:
-            logger.debug(f"Keyword '{keyword}' matched in item '{item.id}' (+{weight})")
-            score += weight
 
-    for pattern, bonus in pattern_bonuses:
-        if re.search(pattern, content, flags=re.IGNORECASE):
-            logger.debug(f"Pattern '{pattern}' matched in item '{item.id}' (+{bonus})")
-            score += bonus
+def get_scorer() -> RelevanceScorer:
+    """
+    Return the scorer currently in use.
+    """
+    return _scorer
+
+
+def reload_relevance_config(config_path: str | None = None) -> RelevanceScorer:
+    """
+    Compile the relevance config into a new scorer and swap it in atomically.
+    Args:
+        config_path (str, optional): Config file to load. Defaults to the current scorer's file.
+    Returns:
+        RelevanceScorer: The newly active scorer.
+    Raises:
+        Any error from reading or parsing the config; the previous scorer stays active in that case.
+    """
+    global _scorer, KEYWORD_SCORES, PATTERN_BONUSES, SOURCE_WEIGHTS, THRESHOLD
+    with _reload_lock:
+        path = config_path or _scorer.config_path or DEFAULT_CONFIG_PATH
+        scorer = RelevanceScorer.from_file(path)
+        _scorer = scorer
+        KEYWORD_SCORES = scorer.keyword_scores
+        PATTERN_BONUSES = scorer.pattern_bonuses
+        SOURCE_WEIGHTS = scorer.source_weights
+        THRESHOLD = scorer.threshold
+    logger.info(f"Reloaded relevance config from {path}")
+    return scorer
 
-    source_weight = source_weights.get(item.source.lower(), 1.0)
-    final_score = score * source_weight
-    logger.debug(f"Item '{item.id}' base score: {score}, source weight: {source_weight}, final score: {final_score}")
-    return final_score
+
+def reload_if_changed() -> bool:
+    """
+    Reload the relevance config if its file was modified since the last load.
+    Returns:
+        bool: True if a new scorer was swapped in, False otherwise.
+    """
+    scorer = _scorer
+    if scorer.config_path is None:
+        return False
+    try:
+        mtime = Path(scorer.config_path).stat().st_mtime
+    except OSError as e:
+        logger.warning(f"Cannot stat relevance config {scorer.config_path}: {e}")
+        return False
+    if mtime == scorer.mtime:
+        return False
+    try:
+        reload_relevance_config(scorer.config_path)
+    except Exception as e:
+        logger.error(f"Error reloading relevance config, keeping previous one: {e}")
+        return False
+    return True
+
+
+def compute_relevance_score(item: NewsItem) -> float:
+    return _scorer.score(item)
 
 def is_relevant(item: NewsItem, threshold: float = None) -> bool:
     """
@@ -48,9 +153,10 @@ def is_relevant(item: NewsItem, threshold: float = None) -> bool:
     Returns:
         bool: True if the item is relevant, False otherwise.
     """
+    scorer = _scorer
     if threshold is None:
-        threshold = THRESHOLD
-    score = compute_relevance_score(item)
+        threshold = scorer.threshold
+    score = scorer.score(item)
     relevant = score >= threshold
     logger.debug(f"Item '{item.id}' relevance: {score} (threshold: {threshold}) -> {'relevant' if relevant else 'not relevant'}")
     return relevant
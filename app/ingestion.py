@@ -2,18 +2,26 @@ import os
 import logging
 from datetime import datetime, timezone
 from pathlib import Path
+from itertools import islice
+from typing import Container
 
-import feedparser
 import praw
 import yaml
 from dotenv import load_dotenv
 from feedfinder2 import find_feeds
 
+from app.feed_parsing import MAX_SUMMARY_CHARS, iter_feed_entries, open_feed
+
 logger = logging.getLogger(__name__)
 
 # Load credentials from .env file (if available)
 load_dotenv()
 
+# Entry IDs read from each feed URL in recent polls, oldest first, so entries the
+# relevance filter rejected also count as already seen on the next poll
+SEEN_ENTRIES_PER_FEED = 500
+_seen_entry_ids: dict[str, dict[str, None]] = {}
+
 
 def load_config_key(key: str, config_path: str = "config/feeds.yaml", default=None):
     """
@@ -86,12 +94,25 @@ def fetch_reddit_posts(subreddits: list[str] | None = None, limit: int = 10) ->
     return posts
 
 
-def fetch_website_news(feeds: dict[str, str] | None = None, limit_per_feed: int = 10) -> list[dict[str, any]]:
+def fetch_website_news(
+    feeds: dict[str, str] | None = None,
+    limit_per_feed: int = 10,
+    known_ids: Container[str] | None = None,
+    max_summary_chars: int = MAX_SUMMARY_CHARS,
+    seen_ids: dict[str, dict[str, None]] | None = None,
+) -> list[dict[str, any]]:
     """
     Fetch recent entries from multiple websites. If a feed value is a homepage URL, try to auto-discover the RSS feed.
+    Feeds are parsed incrementally: reading stops after `limit_per_feed` entries or at the
+    first already seen entry, since feeds list their newest entries first. An entry is
+    already seen if its ID is in `known_ids` or was read from the same feed by an
+    earlier call sharing `seen_ids`.
     Args:
         feeds (dict[str, str]): Dictionary of feed names and URLs. If None, loads from config.
         limit_per_feed (int): Maximum number of items to fetch from each feed.
+        known_ids (Container[str], optional): IDs of items already ingested (e.g. the storage).
+        max_summary_chars (int): Longer entry summaries are truncated to this length.
+        seen_ids (dict, optional): Per feed URL record of read entry IDs, updated in place.
     Returns:
         List[Dict]: A list of dictionaries containing feed items.
     """
@@ -114,19 +135,28 @@ def fetch_website_news(feeds: dict[str, str] | None = None, limit_per_feed: int
                     continue
 
             for feed_url in feed_urls:
-                d = feedparser.parse(feed_url)
-                for entry in d.entries[:limit_per_feed]:
-                    published = entry.get("published_parsed")
-                    published_at = (
-                        datetime(*published[:6]).isoformat() if published else datetime.now(datetime.timezone.utc).isoformat()
-                    )
-                    items.append({
-                        "id": f"{source_name}-{entry.get('id', entry.get('link'))}",
-                        "source": source_name,
-                        "title": entry.title,
-                        "body": entry.get("summary", ""),
-                        "published_at": published_at
-                    })
+                seen = seen_ids.setdefault(feed_url, {}) if seen_ids is not None else {}
+                with open_feed(feed_url) as stream:
+                    fetched = 0
+                    for entry in iter_feed_entries(stream, max_summary_chars=max_summary_chars):
+                        item_id = f"{source_name}-{entry['id']}"
+                        if item_id in seen or (known_ids is not None and item_id in known_ids):
+                            logger.debug(f"Reached already seen entry {item_id}, stopping {feed_url}")
+                            break
+                        seen[item_id] = None
+                        published = entry["published"] or datetime.now(timezone.utc)
+                        items.append({
+                            "id": item_id,
+                            "source": source_name,
+                            "title": entry["title"],
+                            "body": entry["summary"],
+                            "published_at": published.isoformat()
+                        })
+                        fetched += 1
+                        if fetched >= limit_per_feed:
+                            break
+                for stale in list(islice(seen, max(0, len(seen) - SEEN_ENTRIES_PER_FEED))):
+                    del seen[stale]
 
         except Exception as e:
             logger.error(f"Error fetching from {source_name} ({url}): {e}")
@@ -134,12 +164,17 @@ def fetch_website_news(feeds: dict[str, str] | None = None, limit_per_feed: int
     return items
 
 
-def fetch_all_sources(include_reddit: bool = True, include_rss: bool = True) -> list[dict[str, any]]:
+def fetch_all_sources(
+    include_reddit: bool = True,
+    include_rss: bool = True,
+    known_ids: Container[str] | None = None,
+) -> list[dict[str, any]]:
     """
     Fetch news from all sources and return combined list.
     Args:
         include_reddit (bool): Whether to include Reddit posts.
         include_rss (bool): Whether to include RSS feed items.
+        known_ids (Container[str], optional): IDs of items already ingested, used to stop reading feeds early.
     Returns:
         List[Dict]: A list of dictionaries containing news items from all sources.
     """
@@ -148,5 +183,5 @@ def fetch_all_sources(include_reddit: bool = True, include_rss: bool = True) ->
     if include_reddit:
         items += fetch_reddit_posts()
     if include_rss:
-        items += fetch_website_news()
+        items += fetch_website_news(known_ids=known_ids, seen_ids=_seen_entry_ids)
     return items
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from pydantic.config import ConfigDict
 from typing import Optional
 from datetime import datetime
@@ -22,4 +22,32 @@ class NewsItem(BaseModel):
                 "published_at": "2025-06-14T09:00:00Z"
             }
         }
-    )
\ No newline at end of file
+    )
+
+
+class Subscription(BaseModel):
+    id: Optional[str] = Field(default=None, description="Identifier assigned by the server on registration")
+    name: str = Field(default="", description="Optional human readable name")
+    source: Optional[str] = Field(default=None, description="Only match items from this source (case-insensitive)")
+    keywords: list[str] = Field(default_factory=list, description="Words or phrases that must all appear in the title")
+    min_score: Optional[float] = Field(default=None, description="Only match items with at least this relevance score")
+    max_items: int = Field(default=100, ge=1, le=10000, description="Number of matched items kept for this subscription")
+
+    model_config = ConfigDict(
+        extra="forbid",
+        json_schema_extra={
+            "example": {
+                "name": "Ars CVEs",
+                "source": "arstechnica",
+                "keywords": ["CVE"],
+                "min_score": 5
+            }
+        }
+    )
+
+    @model_validator(mode="after")
+    def check_has_criteria(self):
+        self.keywords = [keyword.strip() for keyword in self.keywords if keyword.strip()]
+        if self.source is None and not self.keywords and self.min_score is None:
+            raise ValueError("A subscription needs at least one of source, keywords or min_score")
+        return self
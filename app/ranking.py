@@ -1,8 +1,30 @@
 import logging
+import math
+from bisect import bisect_left, insort
+from datetime import datetime, timezone
+
 from app.models import NewsItem
 
 logger = logging.getLogger(__name__)
 
+RELEVANCE_MODE = "relevance"
+DECAYED_MODE = "decayed"
+RANKING_MODES = (RELEVANCE_MODE, DECAYED_MODE)
+DEFAULT_HALF_LIFE_HOURS = 24.0
+
+def ranking_key(item: NewsItem) -> tuple:
+    """
+    Sort key ordering items by:
+    1. Descending relevance score
+    2. Descending published_at timestamp
+    3. Lexicographical ID order (tie-breaker)
+    """
+    return (
+        -item.relevance_score if item.relevance_score is not None else 0,
+        -item.published_at.timestamp(),
+        item.id
+    )
+
 def sort_news_items(items: list[NewsItem]) -> list[NewsItem]:
     """
     Sort news items by:
@@ -11,11 +33,99 @@ def sort_news_items(items: list[NewsItem]) -> list[NewsItem]:
     3. Lexicographical ID order (tie-breaker)
     """
     logger.debug(f"Sorting {len(items)} news items by relevance and recency.")
-    return sorted(
-        items,
-        key=lambda item: (
-            -item.relevance_score if item.relevance_score is not None else 0,
-            -item.published_at.timestamp(),
-            item.id
-        )
-    )
\ No newline at end of file
+    return sorted(items, key=ranking_key)
+
+def decay_rate(half_life_hours: float) -> float:
+    """
+    Convert a half-life in hours into a per-second exponential decay rate.
+    """
+    if half_life_hours <= 0:
+        raise ValueError("half_life_hours must be positive")
+    return math.log(2) / (half_life_hours * 3600)
+
+def decayed_score(item: NewsItem, half_life_hours: float, now: datetime | None = None) -> float:
+    """
+    Relevance score decayed by age: score * e^(-lambda * age_seconds).
+    """
+    now = now or datetime.now(timezone.utc)
+    score = item.relevance_score or 0
+    age = (now - item.published_at).total_seconds()
+    return score * math.exp(-decay_rate(half_life_hours) * age)
+
+def decayed_ranking_key(half_life_hours: float):
+    """
+    Build a sort key ordering items by descending decayed score.
+
+    Since log(score * e^(-lambda * (now - ts))) = log(score) + lambda * ts - lambda * now,
+    and the last term is the same for every item, ranking by log(score) + lambda * ts
+    gives the decayed order at any point in time. The key therefore never goes
+    stale and the index does not need re-sorting as the clock advances.
+    Items without a positive score rank last, most recent first.
+    """
+    rate = decay_rate(half_life_hours)
+
+    def key(item: NewsItem) -> tuple:
+        published_ts = item.published_at.timestamp()
+        score = item.relevance_score
+        if score is None or score <= 0:
+            return (math.inf, -published_ts, item.id)
+        return (-(math.log(score) + rate * published_ts), -published_ts, item.id)
+
+    return key
+
+
+class RankedIndex:
+    """
+    Incrementally maintained ranking of item IDs.
+
+    Keys are kept in a sorted list, so adding or rescoring an item costs a
+    bisect plus a list insert instead of re-sorting the whole corpus on read.
+    Keys end with the item ID, which makes every key unique. Not thread-safe;
+    the owner is expected to hold its own lock.
+    """
+
+    def __init__(self, key=ranking_key):
+        self._key = key
+        self._keys: list[tuple] = []
+        self._key_by_id: dict[str, tuple] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, item: NewsItem) -> None:
+        """
+        Insert an item, or move it if it is already indexed.
+        """
+        if item.id in self._key_by_id:
+            self.remove(item.id)
+        key = self._key(item)
+        self._key_by_id[item.id] = key
+        insort(self._keys, key)
+
+    def remove(self, item_id: str) -> None:
+        key = self._key_by_id.pop(item_id, None)
+        if key is None:
+            return
+        pos = bisect_left(self._keys, key)
+        if pos < len(self._keys) and self._keys[pos] == key:
+            del self._keys[pos]
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._key_by_id.clear()
+
+    def rebuild(self, items, key=None) -> None:
+        """
+        Re-index the given items from scratch, optionally with a new key function.
+        """
+        if key is not None:
+            self._key = key
+        self._key_by_id = {item.id: self._key(item) for item in items}
+        self._keys = sorted(self._key_by_id.values())
+
+    def ids(self, limit: int | None = None) -> list[str]:
+        """
+        Return indexed item IDs in rank order, optionally only the first `limit`.
+        """
+        keys = self._keys if limit is None else self._keys[:limit]
+        return [key[-1] for key in keys]
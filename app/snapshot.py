@@ -0,0 +1,159 @@
+import logging
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from threading import Lock
+from typing import Iterator
+
+from app.models import NewsItem
+from app.ranking import RANKING_MODES
+
+logger = logging.getLogger(__name__)
+
+# Snapshot layout (little-endian):
+#   header   magic (8s) | version (u64) | record count (u32) | reserved (u32)
+#   offsets  count + 1 u64 record boundaries, relative to the start of the data section
+#   orders   one u32 array of record indexes per ranking mode, in RANKING_MODES order
+#   data     records, each the item's API JSON encoding, in storage insertion order
+MAGIC = b"NEWSSNAP"
+HEADER = struct.Struct("<8sQII")
+
+
+def write_snapshot(path: str | Path, version: int, items: list[NewsItem], orders: dict[str, list[int]]) -> None:
+    """
+    Atomically publish a snapshot of the given items.
+
+    The snapshot is written to a temporary file in the same directory and renamed
+    over `path`, so readers either see the previous snapshot or the complete new one.
+    Args:
+        path (str | Path): Destination file.
+        version (int): Storage version the snapshot was taken at.
+        items (list[NewsItem]): Items to store, records are indexed by position in this list.
+        orders (dict[str, list[int]]): Record indexes in rank order, for every ranking mode.
+    """
+    path = Path(path)
+    records = [item.model_dump_json().encode() for item in items]
+    offsets = [0]
+    for record in records:
+        offsets.append(offsets[-1] + len(record))
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, version, len(records), 0))
+            f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+            for mode in RANKING_MODES:
+                f.write(struct.pack(f"<{len(records)}I", *orders[mode]))
+            f.writelines(records)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    logger.debug(f"Published snapshot v{version} with {len(records)} items to {path}.")
+
+
+class _MappedSnapshot:
+    """
+    A single memory-mapped snapshot file. Offsets and orders are read in place.
+    """
+
+    def __init__(self, path: Path):
+        with path.open("rb") as f:
+            stat = os.fstat(f.fileno())
+            self.file_id = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.version, self.count, _ = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a news snapshot")
+        view = memoryview(self._mm)
+        offsets_start = HEADER.size
+        orders_start = offsets_start + 8 * (self.count + 1)
+        self._data_start = orders_start + 4 * self.count * len(RANKING_MODES)
+        self._offsets = view[offsets_start:orders_start].cast("Q")
+        self._orders = {
+            mode: view[orders_start + 4 * self.count * i:orders_start + 4 * self.count * (i + 1)].cast("I")
+            for i, mode in enumerate(RANKING_MODES)
+        }
+
+    def record(self, index: int) -> bytes:
+        start = self._data_start + self._offsets[index]
+        end = self._data_start + self._offsets[index + 1]
+        return self._mm[start:end]
+
+    def ranked_records(self, limit: int | None, mode: str) -> list[bytes]:
+        order = self._orders[mode]
+        count = self.count if limit is None else min(limit, self.count)
+        return [self.record(order[i]) for i in range(count)]
+
+
+class SnapshotReader:
+    """
+    Read-only view of the snapshot published by the writer process.
+
+    The file is memory-mapped, so every worker process shares the same page cache
+    pages instead of holding its own copy of the corpus. `refresh` is a single
+    stat call and remaps only when the writer has published a new file.
+    """
+
+    def __init__(self, path: str | Path):
+        self._path = Path(path)
+        self._snapshot: _MappedSnapshot | None = None
+        self._lock = Lock()
+        self.refresh()
+
+    @property
+    def version(self) -> int | None:
+        snapshot = self._snapshot
+        return snapshot.version if snapshot else None
+
+    def refresh(self) -> bool:
+        """
+        Map the latest published snapshot if the file changed.
+        Returns:
+            bool: True if a new snapshot was mapped.
+        """
+        try:
+            stat = self._path.stat()
+        except FileNotFoundError:
+            return False
+        current = self._snapshot
+        if current is not None and current.file_id == (stat.st_ino, stat.st_mtime_ns, stat.st_size):
+            return False
+        with self._lock:
+            try:
+                snapshot = _MappedSnapshot(self._path)
+            except (OSError, ValueError, struct.error) as e:
+                logger.error(f"Error mapping snapshot {self._path}: {e}")
+                return False
+            # The previous map is released once no request references it any more
+            self._snapshot = snapshot
+        logger.info(f"Mapped snapshot v{snapshot.version} with {snapshot.count} items.")
+        return True
+
+    def ranked_json(self, limit: int | None = None, mode: str = RANKING_MODES[0]) -> bytes:
+        """
+        Return the ranked items as a JSON array, assembled from the stored records.
+        """
+        return self.ranked_json_with_version(limit=limit, mode=mode)[1]
+
+    def ranked_json_with_version(self, limit: int | None = None, mode: str = RANKING_MODES[0]) -> tuple[int | None, bytes]:
+        """
+        Like `ranked_json`, also returning the version of the snapshot it was read from.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None, b"[]"
+        return snapshot.version, b"[" + b",".join(snapshot.ranked_records(limit, mode)) + b"]"
+
+    def iter_items(self, start: int = 0) -> Iterator[tuple[int, NewsItem]]:
+        """
+        Yield (position, item) pairs in insertion order from the current snapshot,
+        matching the positions of NewsStorage.iter_items.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return
+        for position in range(start, snapshot.count):
+            yield position, NewsItem.model_validate_json(snapshot.record(position))
@@ -1,50 +1,163 @@
 import json
+import time
 from pathlib import Path
 from threading import Lock
 from datetime import datetime, timedelta, timezone
-from pathlib import Path
+from typing import Iterator
 
 from app.models import NewsItem
+from app.ranking import (
+    DECAYED_MODE,
+    DEFAULT_HALF_LIFE_HOURS,
+    RELEVANCE_MODE,
+    RankedIndex,
+    decayed_ranking_key,
+)
+from app.snapshot import write_snapshot
 
 import logging
 logger = logging.getLogger(__name__)
 
+# Minimum time between snapshots published while a rescore is in progress
+RESCORE_PUBLISH_INTERVAL = 1.0
+
 # TODO: In a production environment, I would consider using a database like SQLite or PostgreSQL, now skipped for time limits.
 class NewsStorage:
-    def __init__(self, persistence_file: str = ".data/news_store.json"):
+    def __init__(
+        self,
+        persistence_file: str = ".data/news_store.json",
+        half_life_hours: float = DEFAULT_HALF_LIFE_HOURS,
+        snapshot_file: str | None = None,
+    ):
         # Ensure .data directory exists
         data_dir = Path(persistence_file).parent
         data_dir.mkdir(parents=True, exist_ok=True)
         self._store: dict[str, NewsItem] = {}
+        # Insertion order of item IDs; positions are stable until the store is cleared
+        self._order: list[str] = []
+        self._generation = 0
         self._file = Path(persistence_file)
         self._lock = Lock()
+        self._snapshot_file = Path(snapshot_file) if snapshot_file else None
+        # Starts from the clock so versions keep increasing across restarts
+        self._version = time.time_ns()
+        self._published_version = None
+        self._half_life_hours = half_life_hours
+        self._rankings: dict[str, RankedIndex] = {
+            RELEVANCE_MODE: RankedIndex(),
+            DECAYED_MODE: RankedIndex(key=decayed_ranking_key(half_life_hours)),
+        }
         self.load_from_file()
+        self._publish_snapshot()
 
     def add(self, item: NewsItem) -> None:
         with self._lock:
             if item.id not in self._store:  # Check if the item already exists
                 self._store[item.id] = item
+                self._order.append(item.id)
+                self._index(item)
                 self.save_to_file()
+                self._changed()
                 logger.info(f"Stored news item: {item.id}")
             else:
                 logger.debug(f"Skipped duplicate news item: {item.id}")
 
-    def add_many(self, items: list[NewsItem]) -> None:
+    def add_many(self, items: list[NewsItem]) -> list[NewsItem]:
+        """
+        Store the items that are not stored yet and return them.
+        """
         with self._lock:
-            newly_added = 0
+            added = []
             for item in items:
                 if item.id not in self._store:  # Check if the item already exists
                     self._store[item.id] = item
-                    newly_added += 1
-            if newly_added > 0:
+                    self._order.append(item.id)
+                    self._index(item)
+                    added.append(item)
+            if added:
                 self.save_to_file()
-            logger.info(f"Stored {newly_added} new news items out of {len(items)}.")
+                self._changed()
+            logger.info(f"Stored {len(added)} new news items out of {len(items)}.")
+        return added
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._store
+
+    @property
+    def version(self) -> int:
+        """
+        Counter increased on every change to the stored items or their ranking.
+        """
+        return self._version
 
     def get_all(self) -> list[NewsItem]:
         with self._lock:
             logger.debug("Retrieving all news items.")
             return list(self._store.values())
 
+    def get_ranked(self, limit: int | None = None, mode: str = RELEVANCE_MODE) -> list[NewsItem]:
+        """
+        Return stored items in rank order, optionally only the top `limit`.
+        Args:
+            limit (int, optional): Maximum number of items to return.
+            mode (str): "relevance" ranks by score then recency, "decayed" by time-decayed score.
+        Returns:
+            list[NewsItem]: The ranked items.
+        """
+        return self.get_ranked_with_version(limit=limit, mode=mode)[1]
+
+    def get_ranked_with_version(self, limit: int | None = None, mode: str = RELEVANCE_MODE) -> tuple[int, list[NewsItem]]:
+        """
+        Like `get_ranked`, also returning the storage version the items were read at.
+        """
+        ranking = self._rankings.get(mode)
+        if ranking is None:
+            raise ValueError(f"Unknown ranking mode: {mode}")
+        with self._lock:
+            return self._version, [self._store[item_id] for item_id in ranking.ids(limit)]
+
+    @property
+    def half_life_hours(self) -> float:
+        return self._half_life_hours
+
+    def set_half_life(self, half_life_hours: float) -> None:
+        """
+        Change the half-life of the decayed ranking, re-indexing the corpus if it differs.
+        """
+        key = decayed_ranking_key(half_life_hours)
+        with self._lock:
+            if half_life_hours == self._half_life_hours:
+                return
+            self._half_life_hours = half_life_hours
+            self._rankings[DECAYED_MODE].rebuild(self._store.values(), key=key)
+            self._changed()
+        logger.info(f"Decayed ranking half-life set to {half_life_hours}h.")
+
+    def iter_items(self, start: int = 0, batch_size: int = 500) -> Iterator[tuple[int, NewsItem]]:
+        """
+        Yield (position, item) pairs in insertion order, starting at position `start`.
+
+        Items are copied out in batches under the lock, so memory use does not grow
+        with the store and writers are never blocked for long. Items added while
+        iterating are included; iteration stops if the store is cleared.
+        Args:
+            start (int): Position to resume from, i.e. the last yielded position + 1.
+            batch_size (int): Number of items fetched per lock acquisition.
+        """
+        with self._lock:
+            generation = self._generation
+        position = start
+        while True:
+            with self._lock:
+                if self._generation != generation:
+                    return
+                batch = [self._store[item_id] for item_id in self._order[position:position + batch_size]]
+            if not batch:
+                return
+            for item in batch:
+                yield position, item
+                position += 1
+
     def get_by_source(self, source: str) -> list[NewsItem]:
         with self._lock:
             return [item for item in self._store.values() if item.source.lower() == source.lower()]
@@ -57,9 +170,84 @@ class NewsStorage:
     def clear(self) -> None:
         with self._lock:
             self._store.clear()
+            self._order.clear()
+            self._generation += 1
+            for ranking in self._rankings.values():
+                ranking.clear()
             self.save_to_file()
+            self._changed()
         logger.info("Cleared all news items from storage.")
 
+    def rescore(self, score_fn, batch_size: int = 500) -> int:
+        """
+        Recompute relevance scores for all stored items in chunks.
+
+        Scores are computed outside the lock and applied one chunk at a time,
+        so readers are only blocked for the duration of a single chunk update.
+        Rescored items replace the stored ones (readers holding the old objects
+        are unaffected) and are moved within the ranking in place. The version is
+        bumped after every chunk that changed a score, so version-keyed caches
+        follow the ranking as it changes; the snapshot is republished at most
+        every RESCORE_PUBLISH_INTERVAL seconds and once more at the end.
+        Args:
+            score_fn (Callable[[NewsItem], float]): Function computing the new score.
+            batch_size (int): Number of items rescored per chunk.
+        Returns:
+            int: Number of items whose score changed.
+        """
+        with self._lock:
+            item_ids = list(self._store.keys())
+
+        changed = 0
+        last_publish = time.monotonic()
+        for start in range(0, len(item_ids), batch_size):
+            with self._lock:
+                batch = [self._store[i] for i in item_ids[start:start + batch_size] if i in self._store]
+            scores = [(item, score_fn(item)) for item in batch]
+            with self._lock:
+                chunk_changed = 0
+                for item, score in scores:
+                    # Skip items removed or replaced while the chunk was being scored
+                    if self._store.get(item.id) is not item or item.relevance_score == score:
+                        continue
+                    rescored = item.model_copy(update={"relevance_score": score})
+                    self._store[item.id] = rescored
+                    self._index(rescored)
+                    chunk_changed += 1
+                if chunk_changed:
+                    changed += chunk_changed
+                    publish = time.monotonic() - last_publish >= RESCORE_PUBLISH_INTERVAL
+                    self._changed(publish=publish)
+                    if publish:
+                        last_publish = time.monotonic()
+        with self._lock:
+            if self._published_version != self._version:
+                self._publish_snapshot()
+        logger.info(f"Rescored {len(item_ids)} news items, {changed} scores changed.")
+        return changed
+
+    def _index(self, item: NewsItem) -> None:
+        for ranking in self._rankings.values():
+            ranking.add(item)
+
+    def _changed(self, publish: bool = True) -> None:
+        # Must be called with the lock held
+        self._version += 1
+        if publish:
+            self._publish_snapshot()
+
+    def _publish_snapshot(self) -> None:
+        if self._snapshot_file is None:
+            return
+        try:
+            items = list(self._store.values())
+            position = {item.id: i for i, item in enumerate(items)}
+            orders = {mode: [position[i] for i in ranking.ids()] for mode, ranking in self._rankings.items()}
+            write_snapshot(self._snapshot_file, self._version, items, orders)
+            self._published_version = self._version
+        except Exception as e:
+            logger.error(f"Error publishing snapshot: {e}")
+
     def save_to_file(self) -> None:
         try:
             with self._file.open("w") as f:
@@ -76,6 +264,9 @@ class NewsStorage:
             with self._file.open("r") as f:
                 items = json.load(f)
                 self._store = {item["id"]: NewsItem(**item) for item in items}
+                self._order = list(self._store)
+                for ranking in self._rankings.values():
+                    ranking.rebuild(self._store.values())
             logger.info(f"Loaded {len(self._store)} news items from {self._file}.")
         except Exception as e:
             logging.error(f"Error loading storage file: {e}")
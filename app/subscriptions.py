@@ -0,0 +1,193 @@
+import json
+import logging
+import re
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from threading import Lock
+
+from app.models import NewsItem, Subscription
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def _tokens(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class _CompiledSubscription:
+    """
+    A registered subscription with its keyword matchers and bounded item queue.
+    """
+
+    def __init__(self, subscription: Subscription):
+        self.subscription = subscription
+        self.source = subscription.source.lower() if subscription.source else None
+        # Keywords match whole words or phrases, case-insensitively
+        self.patterns = [
+            re.compile(rf"(?<!\w){re.escape(keyword.lower())}(?!\w)") for keyword in subscription.keywords
+        ]
+        self.queue: deque[tuple[int, NewsItem]] = deque(maxlen=subscription.max_items)
+        # Seeded from the clock so sequence numbers keep growing across restarts
+        # and cursors handed out by a previous process stay behind new items
+        self.sequence = time.time_ns()
+
+    def anchor(self) -> tuple[str, str | None]:
+        """
+        Pick the reverse index entry for this subscription: the longest keyword
+        token (every matching title contains it), else the source.
+        """
+        terms = [token for keyword in self.subscription.keywords for token in _tokens(keyword)]
+        if terms:
+            return "term", max(terms, key=len)
+        if self.source is not None:
+            return "source", self.source
+        return "any", None
+
+    def matches(self, item: NewsItem, title: str) -> bool:
+        if self.source is not None and item.source.lower() != self.source:
+            return False
+        min_score = self.subscription.min_score
+        if min_score is not None and (item.relevance_score is None or item.relevance_score < min_score):
+            return False
+        return all(pattern.search(title) for pattern in self.patterns)
+
+
+class SubscriptionRegistry:
+    """
+    Standing filters evaluated against every newly stored item.
+
+    Subscriptions are kept in a reverse index keyed by one keyword token (or by
+    source, for subscriptions without keywords), so each item is only checked
+    against the subscriptions indexed under its title tokens and source instead
+    of against every subscription. Matches are appended to a bounded per-subscription
+    queue, with a sequence number clients use as a cursor.
+    Subscription definitions are persisted; queues are kept in memory only.
+    A cursor ahead of the current sequence (e.g. from a process with a skewed
+    clock) restarts from the oldest queued item instead of returning nothing.
+    """
+
+    def __init__(self, persistence_file: str | None = None):
+        self._file = Path(persistence_file) if persistence_file else None
+        self._subscriptions: dict[str, _CompiledSubscription] = {}
+        self._by_term: dict[str, set[str]] = {}
+        self._by_source: dict[str, set[str]] = {}
+        self._unanchored: set[str] = set()
+        self._lock = Lock()
+        self.load_from_file()
+
+    def _anchor_set(self, compiled: _CompiledSubscription, create: bool) -> set[str] | None:
+        kind, key = compiled.anchor()
+        if kind == "any":
+            return self._unanchored
+        index = self._by_term if kind == "term" else self._by_source
+        return index.setdefault(key, set()) if create else index.get(key)
+
+    def _register(self, subscription: Subscription) -> None:
+        # Must be called with the lock held
+        compiled = _CompiledSubscription(subscription)
+        self._subscriptions[subscription.id] = compiled
+        self._anchor_set(compiled, create=True).add(subscription.id)
+
+    def add(self, subscription: Subscription) -> Subscription:
+        """
+        Register a subscription, assigning it a new ID.
+        """
+        subscription = subscription.model_copy(update={"id": uuid.uuid4().hex})
+        with self._lock:
+            self._register(subscription)
+            self.save_to_file()
+        logger.info(f"Registered subscription {subscription.id}")
+        return subscription
+
+    def remove(self, subscription_id: str) -> bool:
+        with self._lock:
+            compiled = self._subscriptions.pop(subscription_id, None)
+            if compiled is None:
+                return False
+            anchored = self._anchor_set(compiled, create=False)
+            if anchored is not None:
+                anchored.discard(subscription_id)
+            self.save_to_file()
+        logger.info(f"Removed subscription {subscription_id}")
+        return True
+
+    def get_all(self) -> list[Subscription]:
+        with self._lock:
+            return [compiled.subscription for compiled in self._subscriptions.values()]
+
+    def percolate(self, item: NewsItem) -> list[str]:
+        """
+        Queue the item for every subscription it matches.
+        Returns:
+            list[str]: IDs of the matched subscriptions.
+        """
+        title = item.title.lower()
+        matched = []
+        with self._lock:
+            candidates = set(self._unanchored)
+            candidates.update(self._by_source.get(item.source.lower(), ()))
+            for token in set(_tokens(title)):
+                candidates.update(self._by_term.get(token, ()))
+            for subscription_id in candidates:
+                compiled = self._subscriptions[subscription_id]
+                if compiled.matches(item, title):
+                    compiled.sequence += 1
+                    compiled.queue.append((compiled.sequence, item))
+                    matched.append(subscription_id)
+        if matched:
+            logger.debug(f"Item '{item.id}' matched subscriptions {matched}")
+        return matched
+
+    def items(self, subscription_id: str, after: int = 0, limit: int | None = None) -> tuple[list[NewsItem], int]:
+        """
+        Return queued items with a sequence number greater than `after`, oldest first.
+        A cursor beyond the current sequence is treated as unknown and reset, so all
+        queued items are returned.
+        Returns:
+            tuple[list[NewsItem], int]: The items and the cursor to pass as `after` next time.
+        Raises:
+            KeyError: If the subscription does not exist.
+        """
+        with self._lock:
+            compiled = self._subscriptions[subscription_id]
+            if after > compiled.sequence:
+                after = 0
+            entries = [(sequence, item) for sequence, item in compiled.queue if sequence > after]
+            if limit is not None:
+                entries = entries[:limit]
+            cursor = entries[-1][0] if entries else max(after, 0)
+            return [item for _, item in entries], cursor
+
+    def clear_queues(self) -> None:
+        """
+        Drop all queued items, keeping the subscriptions and their cursors.
+        """
+        with self._lock:
+            for compiled in self._subscriptions.values():
+                compiled.queue.clear()
+
+    def save_to_file(self) -> None:
+        if self._file is None:
+            return
+        try:
+            with self._file.open("w") as f:
+                json.dump([c.subscription.model_dump() for c in self._subscriptions.values()], f, indent=2)
+        except Exception as e:
+            logger.error(f"Error saving subscriptions file: {e}")
+
+    def load_from_file(self) -> None:
+        if self._file is None or not self._file.exists():
+            return
+        try:
+            with self._file.open("r") as f:
+                subscriptions = [Subscription(**data) for data in json.load(f)]
+            with self._lock:
+                for subscription in subscriptions:
+                    self._register(subscription)
+            logger.info(f"Loaded {len(subscriptions)} subscriptions from {self._file}.")
+        except Exception as e:
+            logger.error(f"Error loading subscriptions file: {e}")
@@ -0,0 +1,196 @@
+import logging
+import math
+import time
+from threading import Lock
+from typing import Iterable
+
+from app.models import NewsItem
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKET_SECONDS = 3600
+DEFAULT_RETENTION_BUCKETS = 24 * 7
+
+
+class TrendRollups:
+    """
+    Time-bucketed item counts and relevance score sums, maintained at ingest.
+
+    Counters are kept per (keyword, source) pair and per source, bucketed by the
+    item's publication time. Queries read only the buckets of the requested window,
+    so their cost depends on the number of buckets and series, not on the number of
+    stored items. Buckets older than the retention period are dropped.
+    """
+
+    def __init__(self, bucket_seconds: int = DEFAULT_BUCKET_SECONDS, retention_buckets: int = DEFAULT_RETENTION_BUCKETS):
+        self.bucket_seconds = bucket_seconds
+        self.retention_buckets = retention_buckets
+        # series key -> bucket start timestamp -> [count, score sum]
+        self._by_keyword_source: dict[tuple[str, str], dict[int, list[float]]] = {}
+        self._by_source: dict[str, dict[int, list[float]]] = {}
+        self._pruned_before = 0
+        # Bucket of every item counted within the retention period, so each item is counted once
+        self._counted: dict[str, int] = {}
+        # Items recorded while a rebuild is running, by ID, replayed into the rebuilt counters
+        self._pending: dict[str, tuple[NewsItem, list[str]]] | None = None
+        # Bumped by clear(), so a rebuild started before it does not swap old counters back in
+        self._generation = 0
+        self._lock = Lock()
+
+    def _bucket(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds) * self.bucket_seconds
+
+    def _oldest_bucket(self, now: float) -> int:
+        return self._bucket(now) - (self.retention_buckets - 1) * self.bucket_seconds
+
+    def record(self, item: NewsItem, keywords: Iterable[str], now: float | None = None) -> None:
+        """
+        Count an ingested item under its source and every matched keyword.
+        Items already counted are ignored.
+        Args:
+            item (NewsItem): The stored item, with its relevance score set.
+            keywords (Iterable[str]): Keywords the scorer matched in the item.
+            now (float, optional): Current UNIX time, used for retention.
+        """
+        now = time.time() if now is None else now
+        oldest = self._oldest_bucket(now)
+        bucket = self._bucket(item.published_at.timestamp())
+        if bucket < oldest:
+            return
+        score = item.relevance_score or 0.0
+        source = item.source.lower()
+        keywords = list(keywords)
+        with self._lock:
+            if self._pending is not None:
+                self._pending[item.id] = (item, keywords)
+            if oldest > self._pruned_before:
+                self._prune(oldest)
+            if item.id in self._counted:
+                return
+            self._counted[item.id] = bucket
+            self._add(self._by_source.setdefault(source, {}), bucket, score)
+            for keyword in keywords:
+                self._add(self._by_keyword_source.setdefault((keyword, source), {}), bucket, score)
+
+    @staticmethod
+    def _add(series: dict[int, list[float]], bucket: int, score: float) -> None:
+        counters = series.setdefault(bucket, [0, 0.0])
+        counters[0] += 1
+        counters[1] += score
+
+    def _prune(self, oldest: int) -> None:
+        # Must be called with the lock held
+        for table in (self._by_source, self._by_keyword_source):
+            for key in list(table):
+                series = table[key]
+                for bucket in [b for b in series if b < oldest]:
+                    del series[bucket]
+                if not series:
+                    del table[key]
+        for item_id in [i for i, bucket in self._counted.items() if bucket < oldest]:
+            del self._counted[item_id]
+        self._pruned_before = oldest
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_keyword_source.clear()
+            self._by_source.clear()
+            self._counted.clear()
+            self._generation += 1
+
+    def rebuild(self, scored_items: Iterable[tuple[NewsItem, Iterable[str]]], now: float | None = None) -> None:
+        """
+        Replace all counters with those of the given (item, keywords) pairs.
+
+        Items recorded while `scored_items` is consumed are replayed into the new
+        counters before they are swapped in; since recording is idempotent, items
+        also yielded by the iteration are counted once. A rebuild overlapping
+        `clear` is discarded.
+        """
+        with self._lock:
+            self._pending = {}
+            generation = self._generation
+        try:
+            fresh = TrendRollups(self.bucket_seconds, self.retention_buckets)
+            for item, keywords in scored_items:
+                fresh.record(item, keywords, now=now)
+            with self._lock:
+                if generation != self._generation:
+                    logger.info("Trend rollups were cleared during the rebuild, discarding it.")
+                    return
+                for item, keywords in self._pending.values():
+                    fresh.record(item, keywords, now=now)
+                self._by_keyword_source = fresh._by_keyword_source
+                self._by_source = fresh._by_source
+                self._counted = fresh._counted
+                self._pruned_before = fresh._pruned_before
+        finally:
+            with self._lock:
+                self._pending = None
+
+    def query(
+        self,
+        group_by: str = "keyword",
+        keyword: str | None = None,
+        source: str | None = None,
+        window_buckets: int = 24,
+        max_points: int = 48,
+        now: float | None = None,
+    ) -> dict:
+        """
+        Return per-keyword or per-source time series over the last `window_buckets` buckets.
+
+        Windows with more buckets than `max_points` are downsampled by merging
+        consecutive buckets, so the response size stays bounded.
+        Args:
+            group_by (str): "keyword" or "source".
+            keyword (str, optional): Only count items matching this keyword.
+            source (str, optional): Only count items from this source.
+            window_buckets (int): Number of buckets, ending with the current one.
+            max_points (int): Maximum number of points per series.
+            now (float, optional): Current UNIX time.
+        Returns:
+            dict: Bucket sizes, point start times and one series of counts and score sums per group.
+        """
+        if group_by not in ("keyword", "source"):
+            raise ValueError(f"Unknown trend grouping: {group_by}")
+        now = time.time() if now is None else now
+        window_buckets = min(window_buckets, self.retention_buckets)
+        step = math.ceil(window_buckets / max_points)
+        points = math.ceil(window_buckets / step)
+        first = self._bucket(now) - (points * step - 1) * self.bucket_seconds
+        starts = [first + i * step * self.bucket_seconds for i in range(points)]
+        keyword = keyword.lower() if keyword else None
+        source = source.lower() if source else None
+
+        with self._lock:
+            if group_by == "source" and keyword is None:
+                selected = [(name, series) for name, series in self._by_source.items() if source in (None, name)]
+            else:
+                selected = [
+                    (kw if group_by == "keyword" else src, series)
+                    for (kw, src), series in self._by_keyword_source.items()
+                    if keyword in (None, kw) and source in (None, src)
+                ]
+            totals: dict[str, list[list[float]]] = {}
+            for name, series in selected:
+                points_for_name = totals.setdefault(name, [[0, 0.0] for _ in starts])
+                for i, start in enumerate(starts):
+                    for j in range(step):
+                        counters = series.get(start + j * self.bucket_seconds)
+                        if counters:
+                            points_for_name[i][0] += counters[0]
+                            points_for_name[i][1] += counters[1]
+
+        return {
+            "bucket_seconds": self.bucket_seconds,
+            "point_seconds": step * self.bucket_seconds,
+            "starts": starts,
+            "series": {
+                name: {
+                    "counts": [int(count) for count, _ in values],
+                    "score_sums": [round(score_sum, 3) for _, score_sum in values],
+                }
+                for name, values in sorted(totals.items())
+            },
+        }
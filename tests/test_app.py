@@ -1,6 +1,11 @@
+import gzip
+import json
 import pytest
+from datetime import datetime, timezone
 from fastapi.testclient import TestClient
+from app import api
 from app.api import app
+from app.snapshot import SnapshotReader
 from app.models import NewsItem
 from app.filtering import is_relevant, compute_relevance_score
 
@@ -112,3 +117,144 @@ def test_compute_relevance_score():
     score = compute_relevance_score(news_item)
     assert isinstance(score, (int, float))  # Ensure it returns a number
     assert score > 0  # Ensure a positive score
+
+# === Test for /config/reload Endpoint ===
+def test_reload_config():
+    response = client.post("/config/reload")
+    assert response.status_code == 200
+    assert response.json()["status"] == "reloaded"
+
+def test_retrieve_decayed_mode(sample_news):
+    sample_news[0]["published_at"] = datetime.now(timezone.utc).isoformat()
+    client.post("/ingest", json=sample_news)
+
+    response = client.get("/retrieve", params={"mode": "decayed", "limit": 1})
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 1
+    assert data[0]["id"] == "1"  # Fresh item outranks the older, higher scored one
+
+def test_retrieve_invalid_mode():
+    response = client.get("/retrieve", params={"mode": "random"})
+    assert response.status_code == 422
+
+# === Test for read-only workers ===
+def test_read_only_worker_serves_snapshot(sample_news, monkeypatch):
+    client.post("/ingest", json=sample_news)
+    monkeypatch.setattr(api, "snapshot", SnapshotReader(api.SNAPSHOT_FILE))
+    monkeypatch.setattr(api, "storage", None)
+
+    response = client.get("/retrieve")
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == ["2", "1"]
+
+    response = client.post("/ingest", json=sample_news)
+    assert response.status_code == 503
+
+# === Test for /export Endpoint ===
+def test_export_gzip_ndjson(sample_news):
+    client.post("/ingest", json=sample_news)
+
+    response = client.get("/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    records = [json.loads(line) for line in gzip.decompress(response.content).splitlines()]
+    assert [r["id"] for r in records] == ["1", "2"]
+
+def test_export_resume_from_cursor(sample_news):
+    client.post("/ingest", json=sample_news)
+
+    first = client.get("/export", params={"compression": "none", "limit": 1}).text.splitlines()
+    cursor = json.loads(first[-1])["cursor"]
+    rest = client.get("/export", params={"compression": "none", "cursor": cursor}).text.splitlines()
+    assert [json.loads(line)["id"] for line in first + rest] == ["1", "2"]
+
+def test_export_filter_by_source(sample_news):
+    client.post("/ingest", json=sample_news)
+
+    response = client.get("/export", params={"compression": "none", "source": "source a"})
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == ["2"]
+
+# === Test for /retrieve compression and caching ===
+def test_retrieve_compressed(sample_news):
+    client.post("/ingest", json=sample_news)
+
+    plain = client.get("/retrieve", headers={"Accept-Encoding": "identity"})
+    for encoding in ("gzip", "br"):
+        response = client.get("/retrieve", headers={"Accept-Encoding": encoding})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == encoding
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.json() == plain.json()
+
+def test_retrieve_etag_revalidation(sample_news):
+    client.post("/ingest", json=sample_news[:1])
+    etag = client.get("/retrieve").headers["etag"]
+
+    response = client.get("/retrieve", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    client.post("/ingest", json=sample_news[1:])  # New storage version invalidates the payload
+    response = client.get("/retrieve", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert len(response.json()) == 2
+
+# === Test for /trends Endpoint ===
+def test_trends_count_ingested_items(sample_news):
+    now = datetime.now(timezone.utc).isoformat()
+    for item in sample_news:
+        item["published_at"] = now
+    client.post("/ingest", json=sample_news)
+    client.post("/ingest", json=sample_news)  # Duplicates are not counted twice
+
+    response = client.get("/trends", params={"group_by": "source", "keyword": "exploit", "window_hours": 2})
+    assert response.status_code == 200
+    series = response.json()["series"]
+    assert series["source a"]["counts"][-1] == 1
+    assert "source b" not in series
+
+    response = client.get("/trends", params={"group_by": "keyword"})
+    assert response.json()["series"]["patch"]["counts"][-1] == 1
+
+def test_rescore_scores_each_item_once_and_keeps_trends(sample_news, monkeypatch):
+    now = datetime.now(timezone.utc).isoformat()
+    for item in sample_news:
+        item["published_at"] = now
+    client.post("/ingest", json=sample_news)
+
+    scorer = api.get_scorer()
+    scored = []
+    original = type(scorer).score_with_matches
+    monkeypatch.setattr(type(scorer), "score_with_matches", lambda self, item: scored.append(item.id) or original(self, item))
+    api.rescore_stored_items()
+
+    assert sorted(scored) == ["1", "2"]
+    response = client.get("/trends", params={"group_by": "keyword"})
+    assert response.json()["series"]["patch"]["counts"][-1] == 1
+
+# === Test for /subscriptions Endpoints ===
+def test_subscription_feed(sample_news):
+    response = client.post("/subscriptions", json={"source": "Source A", "keywords": ["exploit"]})
+    assert response.status_code == 201
+    subscription_id = response.json()["id"]
+    try:
+        client.post("/ingest", json=sample_news)
+        client.post("/ingest", json=sample_news)  # Duplicates are not queued again
+
+        response = client.get(f"/subscriptions/{subscription_id}/items")
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["id"] for item in data["items"]] == ["2"]
+
+        response = client.get(f"/subscriptions/{subscription_id}/items", params={"after": data["cursor"]})
+        assert response.json()["items"] == []
+        assert subscription_id in [sub["id"] for sub in client.get("/subscriptions").json()]
+    finally:
+        assert client.delete(f"/subscriptions/{subscription_id}").status_code == 200
+
+    assert client.get(f"/subscriptions/{subscription_id}/items").status_code == 404
+
+def test_subscription_without_criteria_rejected():
+    response = client.post("/subscriptions", json={"name": "everything"})
+    assert response.status_code == 422
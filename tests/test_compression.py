@@ -0,0 +1,108 @@
+import gzip
+import threading
+import time
+import brotli
+import pytest
+from app.compression import PayloadCache, compress, negotiate_encoding
+
+@pytest.mark.parametrize("header, expected", [
+    (None, "identity"),
+    ("", "identity"),
+    ("gzip", "gzip"),
+    ("gzip, deflate, br", "br"),
+    ("br;q=0.5, gzip", "gzip"),
+    ("br;q=0, gzip;q=0", "identity"),
+    ("*", "br"),
+    ("*;q=0.1, gzip;q=0.2", "gzip"),
+    ("deflate", "identity"),
+])
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header) == expected
+
+def test_compress_round_trip():
+    body = b'[{"id": "1"}]' * 100
+    assert gzip.decompress(compress(body, "gzip")) == body
+    assert brotli.decompress(compress(body, "br")) == body
+    assert compress(body, "identity") is body
+
+def test_payload_cache_builds_once_per_version():
+    calls = []
+    def build(version):
+        def _build():
+            calls.append(version)
+            return version, f"payload-{version}".encode() * 50
+        return _build
+
+    cache = PayloadCache()
+    _, gz = cache.get("key", "gzip", 1, build(1))
+    _, br = cache.get("key", "br", 1, build(1))  # Reuses the cached uncompressed body
+    version, again = cache.get("key", "gzip", 1, build(1))
+    assert calls == [1]
+    assert version == 1 and again is gz
+    assert brotli.decompress(br) == b"payload-1" * 50
+
+    version, newer = cache.get("key", "gzip", 2, build(2))
+    assert calls == [1, 2]
+    assert gzip.decompress(newer) == b"payload-2" * 50
+
+def test_payload_cache_evicts_least_recently_used():
+    cache = PayloadCache(max_entries=4)
+    for key in ("a", "b", "c"):
+        cache.get(key, "gzip", 1, lambda: (1, b"x"))  # Stores the body and its gzip encoding
+    assert len(cache._entries) == 4
+    assert {cache_key[1] for cache_key in cache._entries} == {"b", "c"}
+
+def test_payload_cache_builds_concurrent_requests_once():
+    calls = []
+    def build():
+        calls.append(1)
+        time.sleep(0.05)
+        return 1, b"payload" * 50
+
+    cache = PayloadCache()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("key", "br", 1, build))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert len({payload for _, payload in results}) == 1
+    assert not cache._building
+
+def test_payload_cache_shares_build_of_newer_version():
+    calls = []
+    started = threading.Event()
+    def build():
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return 2, b"payload" * 50  # The store changed after the request read version 1
+
+    cache = PayloadCache()
+    results = []
+    first = threading.Thread(target=lambda: results.append(cache.get("key", "br", 1, build)))
+    first.start()
+    started.wait()
+    waiters = [threading.Thread(target=lambda: results.append(cache.get("key", "br", 1, build))) for _ in range(4)]
+    for thread in waiters:
+        thread.start()
+    for thread in [first, *waiters]:
+        thread.join()
+    assert len(calls) == 1
+    assert {version for version, _ in results} == {2}
+    assert not cache._building
+    assert cache.get("key", "br", 2, build)[1] == results[0][1]
+
+def test_payload_cache_without_identity_keeps_only_encoded_payloads():
+    calls = []
+    def build():
+        calls.append(1)
+        return 1, b"payload" * 50
+
+    cache = PayloadCache(cache_identity=False)
+    cache.get("key", "gzip", 1, build)
+    cache.get("key", "gzip", 1, build)
+    assert cache.get("key", "identity", 1, build) == (1, b"payload" * 50)
+    assert len(calls) == 2
+    assert [cache_key[2] for cache_key in cache._entries] == ["gzip"]
@@ -0,0 +1,51 @@
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+from app.export import buffered, gzip_stream, iter_export_lines
+from app.models import NewsItem
+
+NOW = datetime(2025, 6, 15, 12, 0, tzinfo=timezone.utc)
+
+def make_items(count):
+    for i in range(count):
+        yield i, NewsItem(
+            id=str(i),
+            title=f"Title {i}",
+            source="arstechnica" if i % 2 else "reddit",
+            published_at=NOW - timedelta(hours=i),
+        )
+
+def decode(lines):
+    return [json.loads(line) for line in b"".join(lines).splitlines()]
+
+def test_export_lines_carry_resume_cursor():
+    records = decode(iter_export_lines(make_items(3)))
+    assert [r["id"] for r in records] == ["0", "1", "2"]
+    assert [r["cursor"] for r in records] == [1, 2, 3]
+
+def test_export_filters_and_limit():
+    records = decode(iter_export_lines(
+        make_items(20),
+        since=NOW - timedelta(hours=10),
+        until=datetime(2025, 6, 15, 11, 0),  # Naive timestamps are treated as UTC
+        source="ArsTechnica",
+        limit=3,
+    ))
+    assert [r["id"] for r in records] == ["3", "5", "7"]  # Item 1 is published exactly at `until`
+
+def test_export_is_lazy():
+    consumed = []
+    def items():
+        for pair in make_items(1000):
+            consumed.append(pair[0])
+            yield pair
+    lines = iter_export_lines(items(), limit=2)
+    assert consumed == []
+    list(lines)
+    assert consumed == [0, 1]
+
+def test_gzip_stream_round_trip():
+    lines = list(iter_export_lines(make_items(500)))
+    compressed = b"".join(gzip_stream(buffered(lines, size=1024)))
+    assert gzip.decompress(compressed) == b"".join(lines)
+    assert len(compressed) < len(b"".join(lines))
@@ -0,0 +1,134 @@
+import pytest
+from datetime import datetime, timezone
+from app.feed_parsing import _translate_html_entities, iter_feed_entries, open_feed
+
+ENTRY_COUNT = 20000
+
+class CountingReader:
+    """
+    Wraps a binary file and records how many bytes were read from it.
+    """
+    def __init__(self, f):
+        self._f = f
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = self._f.read(size)
+        self.bytes_read += len(data)
+        return data
+
+@pytest.fixture
+def large_rss_feed(tmp_path):
+    path = tmp_path / "large_rss.xml"
+    with path.open("w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write('<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel>')
+        f.write("<title>Large feed</title><link>http://example.com</link>")
+        # First entry carries an oversized summary
+        f.write(
+            "<item><title>Huge ransomware writeup</title><link>http://example.com/0</link>"
+            f"<guid>entry-0</guid><description>{'x' * 1_000_000}</description>"
+            "<pubDate>Sun, 15 Jun 2025 12:00:00 GMT</pubDate></item>"
+        )
+        for i in range(1, ENTRY_COUNT):
+            f.write(
+                f"<item><title>Entry {i} breach</title><link>http://example.com/{i}</link>"
+                f"<guid>entry-{i}</guid><description>Summary {i} {'lorem ipsum ' * 50}</description>"
+                "<pubDate>Sun, 15 Jun 2025 11:00:00 +0200</pubDate></item>"
+            )
+        f.write("</channel></rss>")
+    return path
+
+@pytest.fixture
+def large_atom_feed(tmp_path):
+    path = tmp_path / "large_atom.xml"
+    with path.open("w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom"><title>Atom</title>')
+        for i in range(ENTRY_COUNT):
+            f.write(
+                f"<entry><title>Atom {i}</title><id>urn:atom:{i}</id>"
+                f'<link rel="self" href="http://example.com/self/{i}"/><link href="http://example.com/atom/{i}"/>'
+                f"<source><id>urn:source</id><title>Upstream</title></source>"
+                f"<updated>2025-06-15T10:00:00Z</updated><summary>Atom summary {i}</summary></entry>"
+            )
+        f.write("</feed>")
+    return path
+
+
+def test_rss_entries_are_parsed(large_rss_feed):
+    with open_feed(str(large_rss_feed)) as stream:
+        entries = iter_feed_entries(stream, max_summary_chars=100)
+        first, second = next(entries), next(entries)
+
+    assert first["id"] == "entry-0"
+    assert first["title"] == "Huge ransomware writeup"
+    assert first["link"] == "http://example.com/0"
+    assert len(first["summary"]) == 101  # Truncated plus ellipsis
+    assert first["published"] == datetime(2025, 6, 15, 12, 0, tzinfo=timezone.utc)
+    assert second["published"] == datetime(2025, 6, 15, 9, 0, tzinfo=timezone.utc)
+
+def test_stopping_early_does_not_read_whole_feed(large_rss_feed):
+    with large_rss_feed.open("rb") as f:
+        reader = CountingReader(f)
+        entries = []
+        for entry in iter_feed_entries(reader):
+            entries.append(entry)
+            if len(entries) == 10:
+                break
+
+    assert [e["id"] for e in entries] == [f"entry-{i}" for i in range(10)]
+    assert reader.bytes_read < large_rss_feed.stat().st_size / 5
+
+def test_full_parse_yields_every_entry(large_rss_feed):
+    with open_feed(str(large_rss_feed)) as stream:
+        count = sum(1 for _ in iter_feed_entries(stream))
+    assert count == ENTRY_COUNT
+
+def test_atom_entries_ignore_nested_source(large_atom_feed):
+    with open_feed(f"file://{large_atom_feed}") as stream:
+        entry = next(iter_feed_entries(stream))
+
+    assert entry["id"] == "urn:atom:0"
+    assert entry["title"] == "Atom 0"
+    assert entry["link"] == "http://example.com/atom/0"
+    assert entry["summary"] == "Atom summary 0"
+    assert entry["published"] == datetime(2025, 6, 15, 10, 0, tzinfo=timezone.utc)
+
+def test_malformed_feed_keeps_entries_parsed_so_far(tmp_path):
+    path = tmp_path / "broken.xml"
+    path.write_text("<rss><channel><item><title>Ok</title><guid>1</guid></item><item><title>Broken</titel></item>")
+    with open_feed(str(path)) as stream:
+        entries = list(iter_feed_entries(stream))
+    assert [e["id"] for e in entries] == ["1"]
+
+def test_html_is_reduced_to_plain_text(tmp_path):
+    path = tmp_path / "xss.xml"
+    path.write_text(
+        "<rss><channel><item><guid>1</guid>"
+        "<title>Patch &lt;script&gt;alert(1)&lt;/script&gt;now</title>"
+        "<description>&lt;p&gt;Read &lt;a href=&quot;http://e.com/very/long/link&quot;&gt;the advisory&lt;/a&gt;"
+        "&lt;img src=x onerror=alert(1)&gt;&lt;/p&gt;</description></item></channel></rss>"
+    )
+    with open_feed(str(path)) as stream:
+        entry, = iter_feed_entries(stream, max_summary_chars=10)
+    with open_feed(str(path)) as stream:
+        full, = iter_feed_entries(stream)
+
+    assert entry["title"] == "Patch now"
+    assert entry["summary"] == "Read the a…"  # Truncated after removing the markup
+    assert full["summary"] == "Read the advisory"
+
+def test_html_entities_do_not_abort_the_feed(tmp_path):
+    path = tmp_path / "entities.xml"
+    path.write_text(
+        "<rss><channel><item><title>First</title><guid>1</guid></item>"
+        "<item><title>Caf&eacute;&nbsp;breach &amp; leak</title><guid>2</guid></item></channel></rss>"
+    )
+    with open_feed(str(path)) as stream:
+        entries = list(iter_feed_entries(stream))
+    assert [e["id"] for e in entries] == ["1", "2"]
+    assert entries[1]["title"] == "Café breach & leak"
+
+def test_html_entities_split_across_chunks():
+    chunks = [b"<t>caf&ea", b"cute; &amp; &nbsp", b";</t>"]
+    assert b"".join(_translate_html_entities(iter(chunks))) == b"<t>caf&#233; &amp; &#160;</t>"
@@ -1,5 +1,13 @@
+import os
 import pytest
-from app.filtering import compute_relevance_score, is_relevant
+from app.filtering import (
+    DEFAULT_CONFIG_PATH,
+    compute_relevance_score,
+    get_scorer,
+    is_relevant,
+    reload_if_changed,
+    reload_relevance_config,
+)
 from app.models import NewsItem
 from datetime import datetime, timezone
 
@@ -41,3 +49,42 @@ def test_is_relevant_true(high_relevance_item):
 
 def test_is_relevant_false(low_relevance_item):
     assert is_relevant(low_relevance_item) is False
+
+# === TEST: config reload ===
+
+@pytest.fixture
+def restore_scorer():
+    yield
+    reload_relevance_config(DEFAULT_CONFIG_PATH)
+
+def test_reload_swaps_scorer(tmp_path, restore_scorer, low_relevance_item):
+    config_file = tmp_path / "relevance.yaml"
+    config_file.write_text("keyword_scores:\n  terms of service: 10\nsource_weights: {}\nthreshold: 5\n")
+    old_scorer = get_scorer()
+
+    reload_relevance_config(str(config_file))
+
+    assert get_scorer() is not old_scorer
+    assert compute_relevance_score(low_relevance_item) == 10
+    assert is_relevant(low_relevance_item) is True
+
+def test_reload_if_changed_detects_modification(tmp_path, restore_scorer):
+    config_file = tmp_path / "relevance.yaml"
+    config_file.write_text("keyword_scores:\n  breach: 1\n")
+    reload_relevance_config(str(config_file))
+    assert reload_if_changed() is False
+
+    config_file.write_text("keyword_scores:\n  breach: 7\n")
+    os.utime(config_file, (0, get_scorer().mtime + 1))
+    assert reload_if_changed() is True
+    assert get_scorer().keyword_scores == {"breach": 7}
+
+def test_reload_keeps_previous_scorer_on_invalid_config(tmp_path, restore_scorer):
+    config_file = tmp_path / "relevance.yaml"
+    config_file.write_text("keyword_scores:\n  breach: 1\n")
+    scorer = reload_relevance_config(str(config_file))
+
+    config_file.write_text("pattern_bonuses:\n  - pattern: '('\n    bonus: 1\n")
+    os.utime(config_file, (0, scorer.mtime + 1))
+    assert reload_if_changed() is False
+    assert get_scorer() is scorer
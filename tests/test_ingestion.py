@@ -1,5 +1,4 @@
 import pytest
-import time
 from unittest.mock import patch, MagicMock
 from app import ingestion
 
@@ -29,31 +28,63 @@ def test_get_env_or_prompt_fallback(mock_input, mock_getenv):
     val = ingestion.get_env_or_prompt("TEST_VAR", "Prompt:")
     assert val == "dummy_value"
 
-@patch("app.ingestion.feedparser.parse")
 @patch("app.ingestion.find_feeds", return_value=["http://rss.test/feed.xml"])
 @patch("app.ingestion.load_config_key", return_value={"mocksource": "http://rss.test"})
-def test_fetch_website_news(mock_load_config, mock_find_feeds, mock_feedparser):
-    published_time = time.struct_time((2025, 6, 15, 12, 0, 0, 0, 0, 0))
-
-    mock_entry = MagicMock()
-    mock_entry.title = "Mock News"
-    mock_entry.summary = "Important summary"
-    mock_entry.get.side_effect = lambda key, default=None: {
-        "id": "1234",
-        "link": "http://mocksource.com/article",
-        "summary": "Important summary",
-        "published_parsed": published_time,
-    }.get(key, default)
-
-    mock_feed = MagicMock()
-    mock_feed.entries = [mock_entry]
-    mock_feedparser.return_value = mock_feed
-
-    news = ingestion.fetch_website_news()
+def test_fetch_website_news(mock_load_config, mock_find_feeds, tmp_path):
+    feed_file = tmp_path / "feed.xml"
+    feed_file.write_text(
+        "<rss><channel>"
+        "<item><title>Mock News</title><guid>1234</guid><link>http://mocksource.com/article</link>"
+        "<description>Important summary</description><pubDate>Sun, 15 Jun 2025 12:00:00 GMT</pubDate></item>"
+        "</channel></rss>"
+    )
+
+    with patch("app.ingestion.open_feed", side_effect=lambda url: open(feed_file, "rb")):
+        news = ingestion.fetch_website_news()
     assert isinstance(news, list)
     assert len(news) == 1
     assert news[0]["title"] == "Mock News"
     assert news[0]["source"] == "mocksource"
+    assert news[0]["id"] == "mocksource-1234"
+    assert news[0]["body"] == "Important summary"
+
+def test_fetch_website_news_stops_at_limit_and_known_entry(tmp_path):
+    feed_file = tmp_path / "feed.xml"
+    feed_file.write_text(
+        "<rss><channel>"
+        + "".join(f"<item><title>News {i}</title><guid>{i}</guid></item>" for i in range(50))
+        + "</channel></rss>"
+    )
+    feeds = {"mock": str(feed_file)}
+
+    with patch("app.ingestion.open_feed", side_effect=lambda url: open(feed_file, "rb")):
+        limited = ingestion.fetch_website_news(feeds=feeds, limit_per_feed=5)
+        new_only = ingestion.fetch_website_news(feeds=feeds, limit_per_feed=20, known_ids={"mock-3"})
+
+    assert [item["id"] for item in limited] == [f"mock-{i}" for i in range(5)]
+    assert [item["id"] for item in new_only] == ["mock-0", "mock-1", "mock-2"]
+
+def test_fetch_website_news_skips_entries_seen_in_earlier_polls(tmp_path):
+    feed_file = tmp_path / "feed.xml"
+    feeds = {"mock": str(feed_file)}
+    seen_ids = {}
+
+    def write_feed(ids):
+        feed_file.write_text(
+            "<rss><channel>"
+            + "".join(f"<item><title>News {i}</title><guid>{i}</guid></item>" for i in ids)
+            + "</channel></rss>"
+        )
+
+    with patch("app.ingestion.open_feed", side_effect=lambda url: open(feed_file, "rb")):
+        write_feed(range(3))
+        first = ingestion.fetch_website_news(feeds=feeds, known_ids=set(), seen_ids=seen_ids)
+        # None of the entries were stored (e.g. rejected as irrelevant), yet they are not read again
+        write_feed(["new", 0, 1, 2])
+        second = ingestion.fetch_website_news(feeds=feeds, known_ids=set(), seen_ids=seen_ids)
+
+    assert [item["id"] for item in first] == ["mock-0", "mock-1", "mock-2"]
+    assert [item["id"] for item in second] == ["mock-new"]
 
 @patch("app.ingestion.reddit")
 @patch("app.ingestion.load_config_key", return_value=["netsec"])
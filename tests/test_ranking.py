@@ -1,7 +1,7 @@
 import pytest
 from datetime import datetime, timedelta, timezone
 from app.models import NewsItem
-from app.ranking import sort_news_items
+from app.ranking import sort_news_items, RankedIndex, decay_rate, decayed_ranking_key, decayed_score
 
 @pytest.fixture
 def unsorted_news_items():
@@ -34,3 +34,48 @@ def test_sort_with_equal_scores_and_dates():
 
     # Tie on score and time → sort by id
     assert ids == ["x", "y", "z"]
+
+def test_ranked_index_matches_sort(unsorted_news_items):
+    index = RankedIndex()
+    for item in unsorted_news_items:
+        index.add(item)
+    assert index.ids() == [item.id for item in sort_news_items(unsorted_news_items)]
+    assert index.ids(limit=2) == ["a", "b"]
+
+def test_ranked_index_moves_rescored_item(unsorted_news_items):
+    index = RankedIndex()
+    for item in unsorted_news_items:
+        index.add(item)
+    index.add(unsorted_news_items[3].model_copy(update={"relevance_score": 9.0}))
+    assert index.ids() == ["d", "a", "b", "c"]
+    index.remove("a")
+    assert index.ids() == ["d", "b", "c"]
+    assert len(index) == 3
+
+# === Decayed ranking ===
+
+def test_decayed_score_halves_after_half_life():
+    now = datetime.now(timezone.utc)
+    item = NewsItem(id="h", title="H", source="test", published_at=now - timedelta(hours=6), relevance_score=8.0)
+    assert decayed_score(item, half_life_hours=6, now=now) == pytest.approx(4.0)
+
+def test_decayed_key_matches_decayed_score_at_any_time():
+    now = datetime.now(timezone.utc)
+    items = [
+        NewsItem(id="old-high", title="1", source="test", published_at=now - timedelta(hours=10), relevance_score=16.0),
+        NewsItem(id="new-low", title="2", source="test", published_at=now - timedelta(hours=1), relevance_score=3.0),
+        NewsItem(id="mid", title="3", source="test", published_at=now - timedelta(hours=4), relevance_score=6.0),
+        NewsItem(id="unscored", title="4", source="test", published_at=now, relevance_score=None),
+    ]
+    index = RankedIndex(key=decayed_ranking_key(half_life_hours=2))
+    for item in items:
+        index.add(item)
+
+    for later in (now, now + timedelta(hours=5), now + timedelta(days=3)):
+        expected = sorted(items, key=lambda item: -decayed_score(item, 2, now=later))
+        assert index.ids() == [item.id for item in expected]
+    assert index.ids() == ["new-low", "mid", "old-high", "unscored"]
+
+def test_decay_rate_rejects_non_positive_half_life():
+    with pytest.raises(ValueError):
+        decay_rate(0)
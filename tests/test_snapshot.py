@@ -0,0 +1,74 @@
+import json
+from datetime import datetime, timedelta, timezone
+from app.models import NewsItem
+from app.storage import NewsStorage
+from app.snapshot import SnapshotReader, write_snapshot
+
+def make_item(id, score, minutes_ago=0):
+    return NewsItem(
+        id=id,
+        title=f"Title {id}",
+        source="src",
+        body="Ünïcode body",
+        published_at=datetime.now(timezone.utc) - timedelta(minutes=minutes_ago),
+        relevance_score=score,
+    )
+
+def make_storage(tmp_path):
+    return NewsStorage(
+        persistence_file=str(tmp_path / "store.json"),
+        snapshot_file=str(tmp_path / "store.snapshot"),
+        half_life_hours=1,
+    )
+
+def test_reader_serves_writer_ranking(tmp_path):
+    storage = make_storage(tmp_path)
+    storage.add_many([make_item("old", 10.0, minutes_ago=600), make_item("new", 2.0)])
+
+    reader = SnapshotReader(tmp_path / "store.snapshot")
+    assert reader.version == storage.version
+
+    relevance = json.loads(reader.ranked_json())
+    decayed = json.loads(reader.ranked_json(mode="decayed", limit=1))
+    assert [item["id"] for item in relevance] == ["old", "new"]
+    assert [item["id"] for item in decayed] == ["new"]
+    assert relevance[0]["body"] == "Ünïcode body"
+    assert relevance == [json.loads(item.model_dump_json()) for item in storage.get_ranked()]
+
+def test_reader_refreshes_on_new_version(tmp_path):
+    storage = make_storage(tmp_path)
+    reader = SnapshotReader(tmp_path / "store.snapshot")
+    assert reader.ranked_json() == b"[]"
+    assert reader.refresh() is False
+
+    storage.add(make_item("1", 5.0))
+    assert reader.refresh() is True
+    assert reader.version == storage.version
+    assert [item["id"] for item in json.loads(reader.ranked_json())] == ["1"]
+
+    storage.clear()
+    reader.refresh()
+    assert reader.ranked_json() == b"[]"
+
+def test_reader_without_snapshot_file(tmp_path):
+    reader = SnapshotReader(tmp_path / "missing.snapshot")
+    assert reader.version is None
+    assert reader.ranked_json() == b"[]"
+
+def test_write_snapshot_replaces_file_atomically(tmp_path):
+    path = tmp_path / "direct.snapshot"
+    items = [make_item("a", 1.0), make_item("b", 2.0)]
+    write_snapshot(path, 7, items, {"relevance": [1, 0], "decayed": [0, 1]})
+    assert [p.name for p in tmp_path.iterdir()] == ["direct.snapshot"]  # No temporary files left behind
+    reader = SnapshotReader(path)
+    assert reader.version == 7
+    assert [item["id"] for item in json.loads(reader.ranked_json())] == ["b", "a"]
+
+def test_rescore_publishes_final_snapshot(tmp_path):
+    storage = make_storage(tmp_path)
+    storage.add_many([make_item("a", 1.0), make_item("b", 2.0)])
+    storage.rescore(lambda item: 5.0 if item.id == "a" else 1.0, batch_size=1)
+
+    reader = SnapshotReader(tmp_path / "store.snapshot")
+    assert reader.version == storage.version
+    assert [item["id"] for item in json.loads(reader.ranked_json())] == ["a", "b"]
@@ -65,4 +65,69 @@ def test_clear_removes_all_items():
     store.add(make_item("1", "A"))
     store.add(make_item("2", "B"))
     store.clear()
-    assert store.get_all() == []
\ No newline at end of file
+    assert store.get_all() == []
+
+
+def test_get_ranked_orders_by_score():
+    store = NewsStorage()
+    store.clear()
+    low = make_item("low", "src").model_copy(update={"relevance_score": 1.0})
+    high = make_item("high", "src", minutes_ago=5).model_copy(update={"relevance_score": 5.0})
+    store.add_many([low, high])
+    assert [item.id for item in store.get_ranked()] == ["high", "low"]
+    assert [item.id for item in store.get_ranked(limit=1)] == ["high"]
+
+
+def test_rescore_updates_scores_and_ranking():
+    store = NewsStorage()
+    store.clear()
+    store.add_many([make_item("1", "A"), make_item("2", "B", minutes_ago=5)])
+    changed = store.rescore(lambda item: 10.0 if item.source == "B" else 1.0, batch_size=1)
+    assert changed == 2
+    assert [item.id for item in store.get_ranked()] == ["2", "1"]
+    assert store.rescore(lambda item: 10.0 if item.source == "B" else 1.0) == 0
+
+
+def test_get_ranked_decayed_mode_and_half_life_change():
+    store = NewsStorage(half_life_hours=1)
+    store.clear()
+    old_high = make_item("old", "src", minutes_ago=300).model_copy(update={"relevance_score": 10.0})
+    new_low = make_item("new", "src").model_copy(update={"relevance_score": 2.0})
+    store.add_many([old_high, new_low])
+    assert [item.id for item in store.get_ranked(mode="relevance")] == ["old", "new"]
+    assert [item.id for item in store.get_ranked(mode="decayed")] == ["new", "old"]
+
+    store.set_half_life(1000)
+    assert [item.id for item in store.get_ranked(mode="decayed")] == ["old", "new"]
+
+
+def test_iter_items_resumes_from_position():
+    store = NewsStorage()
+    store.clear()
+    store.add_many([make_item(str(i), "src") for i in range(5)])
+    assert [(pos, item.id) for pos, item in store.iter_items(batch_size=2)] == [(i, str(i)) for i in range(5)]
+    assert [item.id for _, item in store.iter_items(start=3)] == ["3", "4"]
+
+
+def test_iter_items_stops_when_cleared():
+    store = NewsStorage()
+    store.clear()
+    store.add_many([make_item(str(i), "src") for i in range(5)])
+    items = store.iter_items(batch_size=2)
+    next(items)
+    store.clear()
+    store.add(make_item("x", "src"))
+    assert [item.id for _, item in items] == ["1"]  # Rest of the already fetched batch only
+
+
+def test_rescore_bumps_version_per_changed_chunk():
+    store = NewsStorage()
+    store.clear()
+    store.add_many([make_item(str(i), "src") for i in range(3)])
+    versions = []
+    def score(item):
+        versions.append(store.version)
+        return float(item.id) + 1
+    store.rescore(score, batch_size=1)
+    # Each chunk is scored after the previous one was applied with a new version
+    assert versions[0] < versions[1] < versions[2] < store.version
@@ -0,0 +1,101 @@
+import pytest
+from datetime import datetime, timezone
+from pydantic import ValidationError
+from app.models import NewsItem, Subscription
+from app.subscriptions import SubscriptionRegistry
+
+def make_item(id, title, source="arstechnica", score=5.0):
+    return NewsItem(id=id, title=title, source=source, published_at=datetime.now(timezone.utc), relevance_score=score)
+
+@pytest.fixture
+def registry():
+    return SubscriptionRegistry()
+
+def test_subscription_requires_criteria():
+    with pytest.raises(ValidationError):
+        Subscription(name="everything")
+    with pytest.raises(ValidationError):
+        Subscription(keywords=["  "])
+
+def test_source_and_keyword(registry):
+    sub = registry.add(Subscription(source="ArsTechnica", keywords=["CVE"]))
+
+    assert registry.percolate(make_item("1", "New CVE-2025-1234 in OpenSSL")) == [sub.id]
+    assert registry.percolate(make_item("2", "New CVE-2025-1234 in OpenSSL", source="reddit")) == []
+    assert registry.percolate(make_item("3", "Recovered data from drive")) == []  # No whole-word match
+    items, cursor = registry.items(sub.id)
+    assert [item.id for item in items] == ["1"]
+    assert registry.items(sub.id, after=cursor) == ([], cursor)
+
+def test_min_score_and_phrase(registry):
+    sub = registry.add(Subscription(min_score=8, keywords=["ransomware", "zero-day"]))
+
+    assert registry.percolate(make_item("1", "Ransomware gang uses zero-day", score=9)) == [sub.id]
+    assert registry.percolate(make_item("2", "Ransomware gang uses zero-day", score=7)) == []
+    assert registry.percolate(make_item("3", "Ransomware hits hospital", score=9)) == []
+
+def test_min_score_only_subscription_sees_all_items(registry):
+    sub = registry.add(Subscription(min_score=1))
+    assert registry.percolate(make_item("1", "Anything at all", source="mock")) == [sub.id]
+
+def test_items_are_only_checked_against_candidates(registry, monkeypatch):
+    ransomware = registry.add(Subscription(keywords=["ransomware"]))
+    for i in range(50):
+        registry.add(Subscription(keywords=[f"unrelated{i}"]))
+    checked = []
+    original = type(registry._subscriptions[ransomware.id]).matches
+    monkeypatch.setattr(
+        type(registry._subscriptions[ransomware.id]), "matches",
+        lambda self, item, title: checked.append(self.subscription.id) or original(self, item, title),
+    )
+
+    registry.percolate(make_item("1", "Ransomware attack"))
+    assert checked == [ransomware.id]
+
+def test_queue_is_bounded_and_cursor_resumes(registry):
+    sub = registry.add(Subscription(keywords=["breach"], max_items=3))
+    for i in range(5):
+        registry.percolate(make_item(str(i), f"Breach number {i}"))
+
+    items, last = registry.items(sub.id)
+    assert [item.id for item in items] == ["2", "3", "4"]
+
+    first, cursor = registry.items(sub.id, limit=1)
+    assert [item.id for item in first] == ["2"]
+    rest, cursor = registry.items(sub.id, after=cursor)
+    assert [item.id for item in rest] == ["3", "4"]
+    assert cursor == last
+    assert registry.items(sub.id, after=cursor) == ([], last)
+
+def test_cursors_survive_restart_and_reset_when_ahead(tmp_path):
+    path = str(tmp_path / "subscriptions.json")
+    registry = SubscriptionRegistry(persistence_file=path)
+    sub = registry.add(Subscription(keywords=["breach"]))
+    registry.percolate(make_item("1", "Breach one"))
+    _, cursor = registry.items(sub.id)
+
+    # Sequence numbers continue past cursors from before the restart
+    restarted = SubscriptionRegistry(persistence_file=path)
+    restarted.percolate(make_item("2", "Breach two"))
+    items, _ = restarted.items(sub.id, after=cursor)
+    assert [item.id for item in items] == ["2"]
+
+    # A cursor from the future returns the oldest queued items rather than an empty page
+    items, new_cursor = restarted.items(sub.id, after=cursor * 2)
+    assert [item.id for item in items] == ["2"]
+    assert new_cursor < cursor * 2
+
+def test_remove_and_persistence(tmp_path):
+    path = str(tmp_path / "subscriptions.json")
+    registry = SubscriptionRegistry(persistence_file=path)
+    kept = registry.add(Subscription(source="reddit"))
+    removed = registry.add(Subscription(keywords=["leak"]))
+    assert registry.remove(removed.id) is True
+    assert registry.remove(removed.id) is False
+    assert registry.percolate(make_item("1", "Password leak", source="mock")) == []
+
+    reloaded = SubscriptionRegistry(persistence_file=path)
+    assert [sub.id for sub in reloaded.get_all()] == [kept.id]
+    assert reloaded.percolate(make_item("2", "Anything", source="Reddit")) == [kept.id]
+    with pytest.raises(KeyError):
+        reloaded.items(removed.id)
@@ -0,0 +1,95 @@
+import pytest
+from datetime import datetime, timezone
+from app.models import NewsItem
+from app.trends import TrendRollups
+
+NOW = datetime(2025, 6, 15, 12, 30, tzinfo=timezone.utc).timestamp()
+HOUR = 3600
+
+def make_item(id, source, hours_ago, score=5.0):
+    return NewsItem(
+        id=id,
+        title=f"Title {id}",
+        source=source,
+        published_at=datetime.fromtimestamp(NOW - hours_ago * HOUR, tz=timezone.utc),
+        relevance_score=score,
+    )
+
+@pytest.fixture
+def rollups():
+    rollups = TrendRollups(retention_buckets=48)
+    rollups.record(make_item("1", "arstechnica", 0), ["ransomware"], now=NOW)
+    rollups.record(make_item("2", "reddit", 0, score=3.0), ["ransomware", "breach"], now=NOW)
+    rollups.record(make_item("3", "arstechnica", 2), ["ransomware"], now=NOW)
+    rollups.record(make_item("4", "Reddit", 1), [], now=NOW)
+    return rollups
+
+def test_keyword_series(rollups):
+    trends = rollups.query(group_by="keyword", window_buckets=3, now=NOW)
+    assert trends["point_seconds"] == HOUR
+    assert trends["series"]["ransomware"]["counts"] == [1, 0, 2]
+    assert trends["series"]["ransomware"]["score_sums"] == [5.0, 0.0, 8.0]
+    assert trends["series"]["breach"]["counts"] == [0, 0, 1]
+
+def test_keyword_by_source(rollups):
+    trends = rollups.query(group_by="source", keyword="Ransomware", window_buckets=3, now=NOW)
+    assert trends["series"]["arstechnica"]["counts"] == [1, 0, 1]
+    assert trends["series"]["reddit"]["counts"] == [0, 0, 1]
+
+def test_source_series_include_items_without_keywords(rollups):
+    trends = rollups.query(group_by="source", source="REDDIT", window_buckets=3, now=NOW)
+    assert list(trends["series"]) == ["reddit"]
+    assert trends["series"]["reddit"]["counts"] == [0, 1, 1]
+
+def test_long_windows_are_downsampled(rollups):
+    trends = rollups.query(group_by="keyword", keyword="ransomware", window_buckets=48, max_points=4, now=NOW)
+    assert trends["point_seconds"] == 12 * HOUR
+    assert len(trends["starts"]) == 4
+    assert trends["series"]["ransomware"]["counts"] == [0, 0, 0, 3]
+
+def test_old_buckets_are_dropped(rollups):
+    rollups.record(make_item("old", "reddit", 100), ["breach"], now=NOW)
+    later = NOW + 48 * HOUR
+    rollups.record(make_item("new", "reddit", -48), ["breach"], now=later)
+    trends = rollups.query(group_by="keyword", window_buckets=48, max_points=48, now=later)
+    assert sum(trends["series"]["breach"]["counts"]) == 1
+    assert "ransomware" not in trends["series"]
+
+def test_rebuild_replaces_counters(rollups):
+    rollups.rebuild([(make_item("9", "mock", 0), ["exploit"])], now=NOW)
+    trends = rollups.query(group_by="keyword", window_buckets=1, now=NOW)
+    assert list(trends["series"]) == ["exploit"]
+
+def test_rebuild_keeps_items_recorded_while_iterating(rollups):
+    def scored_items():
+        yield make_item("9", "mock", 0), ["exploit"]
+        # Ingested while the rebuild runs: once before being iterated, once never iterated
+        rollups.record(make_item("10", "mock", 0), ["exploit"], now=NOW)
+        rollups.record(make_item("11", "mock", 0), ["breach"], now=NOW)
+        yield make_item("10", "mock", 0), ["exploit"]
+
+    rollups.rebuild(scored_items(), now=NOW)
+    trends = rollups.query(group_by="keyword", window_buckets=1, now=NOW)
+    assert trends["series"]["exploit"]["counts"] == [2]
+    assert trends["series"]["breach"]["counts"] == [1]
+    assert "ransomware" not in trends["series"]
+
+def test_record_counts_each_item_once(rollups):
+    rollups.record(make_item("1", "arstechnica", 0), ["ransomware"], now=NOW)
+    trends = rollups.query(group_by="keyword", window_buckets=1, now=NOW)
+    assert trends["series"]["ransomware"]["counts"] == [2]
+
+def test_record_after_rebuild_of_same_item_is_ignored(rollups):
+    # An item stored before the rebuild read the store, but recorded after the swap
+    rollups.rebuild([(make_item("9", "mock", 0), ["exploit"])], now=NOW)
+    rollups.record(make_item("9", "mock", 0), ["exploit"], now=NOW)
+    trends = rollups.query(group_by="keyword", window_buckets=1, now=NOW)
+    assert trends["series"]["exploit"]["counts"] == [1]
+
+def test_clear_discards_running_rebuild(rollups):
+    def scored_items():
+        yield make_item("9", "mock", 0), ["exploit"]
+        rollups.clear()
+
+    rollups.rebuild(scored_items(), now=NOW)
+    assert rollups.query(group_by="keyword", window_buckets=1, now=NOW)["series"] == {}